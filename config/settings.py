@@ -157,6 +157,9 @@ BACKUP_CONFIG = {
     "timestamp_format": "%Y%m%d_%H%M%S",
     "backup_extension": ".bak",
     "max_backups": 10,  # Keep only the latest 10 backups
+    "compression": "zstd",  # "zstd" (Python 3.14+, falls back to deflate) or "deflate"
+    "compression_level": 3,
+    "deduplicate": True,  # Store identical file backups once (hard links into backups/objects)
 }
 
 # Logging configuration
@@ -4,7 +4,7 @@ JetBrains IDE handler for modifying telemetry IDs
 
 import json
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 import logging
 
 from utils.paths import PathManager
@@ -32,7 +32,8 @@ class JetBrainsHandler:
         self.id_generator = IDGenerator()
         self.file_locker = FileLockManager()
     
-    def process_jetbrains_ides(self, create_backups: bool = True, lock_files: bool = True, clean_databases: bool = True) -> Dict[str, Any]:
+    def process_jetbrains_ides(self, create_backups: bool = True, lock_files: bool = True, clean_databases: bool = True,
+                               progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
         """
         Process all JetBrains IDE installations
 
@@ -40,6 +41,7 @@ class JetBrainsHandler:
             create_backups: Whether to create backups before modification
             lock_files: Whether to lock files after modification
             clean_databases: Whether to clean database files
+            progress_callback: Optional callable invoked as (done, total) after each file
 
         Returns:
             Dictionary with processing results
@@ -76,6 +78,13 @@ class JetBrainsHandler:
                 results["errors"].append("No JetBrains ID files found")
                 return results
             
+            db_files = []
+            if clean_databases:
+                db_files = self.path_manager.get_jetbrains_database_files()
+            
+            done = 0
+            total = len(id_files) + len(db_files)
+            
             # Process each ID file
             for file_path in id_files:
                 file_result = self._process_jetbrains_id_file(
@@ -96,11 +105,14 @@ class JetBrainsHandler:
                     results["files_failed"].append(str(file_path))
                     if file_result["error"]:
                         results["errors"].append(f"{file_path.name}: {file_result['error']}")
+                
+                done += 1
+                if progress_callback:
+                    progress_callback(done, total)
             
             # Process database files if requested
             if clean_databases:
                 logger.info("Processing JetBrains database files...")
-                db_files = self.path_manager.get_jetbrains_database_files()
 
                 for db_file in db_files:
                     db_result = self._process_jetbrains_database_file(
@@ -118,6 +130,10 @@ class JetBrainsHandler:
                         if db_result["error"]:
                             results["errors"].append(f"{db_file.name}: {db_result['error']}")
 
+                    done += 1
+                    if progress_callback:
+                        progress_callback(done, total)
+
             # Overall success if at least one file was processed
             results["success"] = (len(results["files_processed"]) > 0 or
                                 len(results["databases_processed"]) > 0)
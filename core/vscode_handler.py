@@ -11,7 +11,7 @@ import sqlite3
 import shutil
 import stat
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 import uuid
 import hashlib
 import secrets
@@ -42,7 +42,8 @@ class VSCodeHandler:
     def process_vscode_installations(self, create_backups: bool = True, 
                                    lock_files: bool = True,
                                    clean_workspace: bool = False,
-                                   clean_cache: bool = False) -> Dict[str, Any]:
+                                   clean_cache: bool = False,
+                                   progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
         """
         处理所有 VSCode 安装
         
@@ -51,6 +52,7 @@ class VSCodeHandler:
             lock_files: 是否锁定文件
             clean_workspace: 是否清理工作区
             clean_cache: 是否清理缓存
+            progress_callback: 进度回调，每处理完一个目录以 (已完成数, 总数) 调用
             
         Returns:
             处理结果字典
@@ -85,7 +87,7 @@ class VSCodeHandler:
             results["total_directories"] = len(vscode_dirs)
             
             # 处理每个 VSCode 目录
-            for vscode_dir in vscode_dirs:
+            for done, vscode_dir in enumerate(vscode_dirs, 1):
                 try:
                     # 获取变体名称
                     variant_name = self.path_manager.get_vscode_variant_name(vscode_dir)
@@ -123,6 +125,9 @@ class VSCodeHandler:
                     logger.error(error_msg)
                     results["errors"].append(error_msg)
                     results["directories_failed"] += 1
+                
+                if progress_callback:
+                    progress_callback(done, results["total_directories"])
             
             # 判断整体成功
             if results["directories_processed"] > 0:
@@ -4,15 +4,16 @@ AugmentCode Unlimited - Streamlit版本
 使用Streamlit框架实现的GUI界面，提供与原GUI相同的功能
 """
 
+import importlib.util
+
 try:
     import streamlit as st
-    import pandas as pd
-    import numpy as np
-    import plotly.express as px
-    import plotly.graph_objects as go
-    import psutil
+    # pandas/plotly/psutil 仅在需要时导入，这里只检查是否已安装，以缩短冷启动时间
+    for _module in ("pandas", "plotly", "psutil"):
+        if importlib.util.find_spec(_module) is None:
+            raise ImportError(_module)
 except ImportError:
-    print("错误: 缺少必要的依赖包。请运行: pip install streamlit>=1.28.0 plotly>=5.15.0 pandas>=1.5.0 numpy>=1.24.0 psutil>=5.9.0")
+    print("错误: 缺少必要的依赖包。请运行: pip install streamlit>=1.28.0 plotly>=5.15.0 pandas>=1.5.0 psutil>=5.9.0")
     import sys
     sys.exit(1)
 import sys
@@ -21,20 +22,33 @@ import time
 import threading
 import traceback
 import subprocess
+import functools
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
 
 # 添加项目根目录到路径
 sys.path.insert(0, str(Path(__file__).parent))
 
-# 全局变量
-APP_NAME = "AugmentCode Unlimited"
-VERSION = "2.0.0"
+# 全局变量（无法导入配置时使用的默认值）
+DEFAULT_APP_NAME = "AugmentCode Unlimited"
+DEFAULT_VERSION = "2.0.0"
 
-try:
-    from config.settings import VERSION, APP_NAME
-except ImportError:
-    st.warning("无法导入配置，使用默认值")
+# 常用目录（模块加载时解析一次）
+HOME = Path.home()
+BACKUP_DIR = HOME / ".augment_cleaner_backups"
+JETBRAINS_DIR = HOME / "Library" / "Application Support" / "JetBrains"
+VSCODE_DIR = HOME / "Library" / "Application Support" / "Code"
+
+@functools.lru_cache(maxsize=1)
+def _load_config():
+    """加载版本号和应用名称，返回 (VERSION, APP_NAME)"""
+    try:
+        from config.settings import VERSION, APP_NAME
+        return VERSION, APP_NAME
+    except ImportError:
+        return DEFAULT_VERSION, DEFAULT_APP_NAME
 
 # 初始化会话状态
 if 'backend_ready' not in st.session_state:
@@ -42,13 +56,23 @@ if 'backend_ready' not in st.session_state:
 if 'components' not in st.session_state:
     st.session_state.components = None
 if 'log_messages' not in st.session_state:
-    st.session_state.log_messages = []
+    st.session_state.log_messages = deque(maxlen=500)
 if 'scan_results' not in st.session_state:
     st.session_state.scan_results = None
+if 'scan_derived' not in st.session_state:
+    st.session_state.scan_derived = None
 if 'clean_results' not in st.session_state:
     st.session_state.clean_results = None
 if 'is_cleaning' not in st.session_state:
     st.session_state.is_cleaning = False
+if 'clean_progress' not in st.session_state:
+    st.session_state.clean_progress = {"stage": "", "done": 0, "total": 0}
+if 'log_seq' not in st.session_state:
+    st.session_state.log_seq = 0
+if '_render_cache' not in st.session_state:
+    st.session_state._render_cache = {}
+if '_last_render_sig' not in st.session_state:
+    st.session_state._last_render_sig = None
 
 def log_message(message, level="info"):
     """添加日志消息到会话状态"""
@@ -58,6 +82,7 @@ def log_message(message, level="info"):
         "message": message,
         "level": level
     })
+    st.session_state.log_seq += 1
 
 def check_permissions():
     """检查并请求必要的权限"""
@@ -65,8 +90,8 @@ def check_permissions():
         log_message("🔒 检查文件权限...")
         
         # 检查备份目录权限
-        backup_dir = os.path.expanduser("~/.augment_cleaner_backups")
-        if not os.path.exists(backup_dir):
+        backup_dir = BACKUP_DIR
+        if not backup_dir.exists():
             try:
                 os.makedirs(backup_dir, exist_ok=True)
                 log_message(f"✅ 创建备份目录: {backup_dir}")
@@ -75,11 +100,11 @@ def check_permissions():
                 return False
         
         # 检查JetBrains目录权限
-        jetbrains_dir = os.path.expanduser("~/Library/Application Support/JetBrains")
-        if os.path.exists(jetbrains_dir):
+        jetbrains_dir = JETBRAINS_DIR
+        if jetbrains_dir.exists():
             try:
                 # 尝试创建测试文件
-                test_file = os.path.join(jetbrains_dir, ".permission_test")
+                test_file = jetbrains_dir / ".permission_test"
                 with open(test_file, "w") as f:
                     f.write("test")
                 os.remove(test_file)
@@ -93,11 +118,11 @@ def check_permissions():
                 return False
         
         # 检查VSCode目录权限
-        vscode_dir = os.path.expanduser("~/Library/Application Support/Code")
-        if os.path.exists(vscode_dir):
+        vscode_dir = VSCODE_DIR
+        if vscode_dir.exists():
             try:
                 # 尝试创建测试文件
-                test_file = os.path.join(vscode_dir, ".permission_test")
+                test_file = vscode_dir / ".permission_test"
                 with open(test_file, "w") as f:
                     f.write("test")
                 os.remove(test_file)
@@ -188,6 +213,8 @@ def scan_system():
         st.warning("后端组件尚未初始化完成，请稍候...")
         return
     
+    import pandas as pd
+    
     components = st.session_state.components
     
     with st.spinner("正在扫描系统..."):
@@ -214,6 +241,22 @@ def scan_system():
                 "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             }
             
+            # 预先计算渲染所需的派生数据，避免每次重绘重复计算
+            st.session_state.scan_derived = {
+                "jb_installed": jetbrains_info["installed"],
+                "jb_existing": len(jetbrains_info["existing_files"]),
+                "jb_missing": len(jetbrains_info["missing_files"]),
+                "vscode_installed": vscode_info["installed"],
+                "vscode_df": pd.DataFrame({
+                    "变体": vscode_info["variants_found"],
+                    "目录数量": [vscode_info["total_directories"]] * len(vscode_info["variants_found"])
+                }),
+                "vscode_dir_count": len(vscode_info["storage_directories"]),
+                "db_total": db_info["total_databases"],
+                "db_accessible": db_info["accessible_databases"],
+                "db_inaccessible": db_info["total_databases"] - db_info["accessible_databases"]
+            }
+            
             # 显示扫描结果
             if jetbrains_info['installed']:
                 log_message(f"✅ 发现 JetBrains IDEs")
@@ -241,6 +284,30 @@ def scan_system():
             traceback.print_exc()
             return False
 
+@dataclass(frozen=True)
+class CleanOptions:
+    """清理选项"""
+    __slots__ = ("jetbrains", "vscode", "backup", "lock", "database", "workspace")
+    
+    jetbrains: bool
+    vscode: bool
+    backup: bool
+    lock: bool
+    database: bool
+    workspace: bool
+    
+    @classmethod
+    def from_session_state(cls):
+        """从会话状态中的复选框读取选项"""
+        return cls(
+            jetbrains=st.session_state.jetbrains,
+            vscode=st.session_state.vscode,
+            backup=st.session_state.backup,
+            lock=st.session_state.lock,
+            database=st.session_state.database,
+            workspace=st.session_state.workspace
+        )
+
 def start_cleaning():
     """开始清理"""
     if not st.session_state.backend_ready:
@@ -254,16 +321,9 @@ def start_cleaning():
     components = st.session_state.components
     
     # 获取选项
-    options = {
-        "jetbrains": st.session_state.jetbrains,
-        "vscode": st.session_state.vscode,
-        "backup": st.session_state.backup,
-        "lock": st.session_state.lock,
-        "database": st.session_state.database,
-        "workspace": st.session_state.workspace
-    }
+    options = CleanOptions.from_session_state()
     
-    if not (options["jetbrains"] or options["vscode"]):
+    if not (options.jetbrains or options.vscode):
         st.warning("请至少选择一个IDE清理选项！")
         return
     
@@ -280,8 +340,19 @@ def start_cleaning():
             return
     
     st.session_state.is_cleaning = True
+    st.session_state.clean_progress = {"stage": "", "done": 0, "total": 0}
     
     with st.spinner("正在清理..."):
+        progress_placeholder = st.progress(0)
+        
+        def make_progress_callback(stage):
+            """创建进度回调，将处理器上报的进度写入共享状态并刷新进度条"""
+            def on_progress(done, total):
+                st.session_state.clean_progress.update(stage=stage, done=done, total=total)
+                if total:
+                    progress_placeholder.progress(done / total, text=f"{stage}: {done}/{total}")
+            return on_progress
+        
         try:
             log_message("🚀 开始清理操作...")
             
@@ -295,11 +366,12 @@ def start_cleaning():
             }
             
             # 清理JetBrains
-            if options["jetbrains"]:
+            if options.jetbrains:
                 log_message("🔧 正在处理 JetBrains IDEs...")
                 result = components["jetbrains_handler"].process_jetbrains_ides(
-                    create_backups=options["backup"],
-                    lock_files=options["lock"]
+                    create_backups=options.backup,
+                    lock_files=options.lock,
+                    progress_callback=make_progress_callback("JetBrains")
                 )
                 
                 clean_results["jetbrains"] = result
@@ -316,12 +388,13 @@ def start_cleaning():
                         log_message(f"   ❌ {error}", "error")
             
             # 清理VSCode
-            if options["vscode"]:
+            if options.vscode:
                 log_message("📝 正在处理 VSCode 系列...")
                 result = components["vscode_handler"].process_vscode_installations(
-                    create_backups=options["backup"],
-                    lock_files=options["lock"],
-                    clean_workspace=options["workspace"]
+                    create_backups=options.backup,
+                    lock_files=options.lock,
+                    clean_workspace=options.workspace,
+                    progress_callback=make_progress_callback("VSCode")
                 )
                 
                 clean_results["vscode"] = result
@@ -346,17 +419,17 @@ def start_cleaning():
                         log_message(f"   ❌ {error}", "error")
             
                 # 清理数据库
-                if options["database"] and options["vscode"]:
+                if options.database and options.vscode:
                     log_message("🗃️ 正在清理数据库...")
                     try:
                         # 清理VSCode数据库
                         vscode_result = components["database_cleaner"].clean_vscode_databases(
-                            create_backups=options["backup"]
+                            create_backups=options.backup
                         )
                         
                         # 清理JetBrains数据库
                         jetbrains_result = components["database_cleaner"].clean_jetbrains_databases(
-                            create_backups=options["backup"]
+                            create_backups=options.backup
                         )
                         
                         # 合并结果
@@ -399,7 +472,7 @@ def start_cleaning():
                 log_message("   2️⃣ 使用新的AugmentCode账户登录")
                 log_message("   3️⃣ 享受无限制的AI编程体验！")
                 
-                if options["backup"]:
+                if options.backup:
                     backup_dir = components["backup_manager"].backup_dir
                     log_message(f"💾 备份位置: {backup_dir}")
                 
@@ -416,6 +489,7 @@ def start_cleaning():
             st.error(f"清理过程中发生错误: {str(e)}")
             return False
         finally:
+            progress_placeholder.empty()
             st.session_state.is_cleaning = False
 
 def show_help():
@@ -451,14 +525,15 @@ def render_log_messages():
         st.text("暂无日志消息")
         return
     
-    log_df = pd.DataFrame(st.session_state.log_messages)
+    cache = st.session_state._render_cache
+    if "log_html" in cache:
+        st.markdown(cache["log_html"], unsafe_allow_html=True)
+        return
     
     # 创建HTML表格
-    html = '<div class="log-container" style="height: 300px; overflow-y: auto; background-color: #f8f9fa; border-radius: 5px; padding: 10px; font-family: monospace;">'
+    html = ['<div class="log-container">']
     
-    for _, log in log_df.iterrows():
-        timestamp = log["timestamp"]
-        message = log["message"]
+    for log in st.session_state.log_messages:
         level = log["level"]
         
         # 根据级别设置颜色
@@ -469,33 +544,27 @@ def render_log_messages():
         else:
             color = "black"
         
-        html += f'<div style="margin-bottom: 5px;"><span style="color: #666;">[{timestamp}]</span> <span style="color: {color};">{message}</span></div>'
+        html.append(f'<div style="margin-bottom: 5px;"><span style="color: #666;">[{log["timestamp"]}]</span> <span style="color: {color};">{log["message"]}</span></div>')
     
-    html += '</div>'
+    html.append('</div>')
     
-    st.markdown(html, unsafe_allow_html=True)
+    cache["log_html"] = ''.join(html)
+    st.markdown(cache["log_html"], unsafe_allow_html=True)
 
-def render_scan_results():
-    """渲染扫描结果"""
-    if not st.session_state.scan_results:
-        return
+def _build_scan_figures(derived):
+    """根据扫描派生数据构建图表"""
+    import plotly.express as px
     
-    scan_results = st.session_state.scan_results
+    figures = {}
     
-    # 创建JetBrains图表
-    if scan_results["jetbrains"]["installed"]:
-        st.subheader("🔧 JetBrains IDEs")
-        
-        # 创建饼图
+    # 创建饼图
+    if derived["jb_installed"]:
         jetbrains_data = {
             "状态": ["已找到", "未找到"],
-            "数量": [
-                len(scan_results["jetbrains"]["existing_files"]),
-                len(scan_results["jetbrains"]["missing_files"])
-            ]
+            "数量": [derived["jb_existing"], derived["jb_missing"]]
         }
         
-        fig = px.pie(
+        figures["jetbrains"] = px.pie(
             jetbrains_data,
             values="数量",
             names="状态",
@@ -503,71 +572,133 @@ def render_scan_results():
             color="状态",
             color_discrete_map={"已找到": "#4CAF50", "未找到": "#F44336"}
         )
+    
+    # 创建条形图
+    if derived["vscode_installed"]:
+        figures["vscode"] = px.bar(
+            derived["vscode_df"],
+            x="变体",
+            y="目录数量",
+            title="VSCode变体分布",
+            color="变体"
+        )
+    
+    # 创建条形图
+    if derived["db_total"] > 0:
+        db_data = {
+            "类型": ["可访问", "不可访问"],
+            "数量": [derived["db_accessible"], derived["db_inaccessible"]]
+        }
+        
+        figures["database"] = px.bar(
+            db_data,
+            x="类型",
+            y="数量",
+            title="数据库可访问性",
+            color="类型",
+            color_discrete_map={"可访问": "#4CAF50", "不可访问": "#F44336"}
+        )
+    
+    return figures
+
+def render_scan_results():
+    """渲染扫描结果"""
+    if not st.session_state.scan_results or not st.session_state.scan_derived:
+        return
+    
+    scan_results = st.session_state.scan_results
+    derived = st.session_state.scan_derived
+    
+    cache = st.session_state._render_cache
+    if "scan_figures" not in cache:
+        cache["scan_figures"] = _build_scan_figures(derived)
+    figures = cache["scan_figures"]
+    
+    # 创建JetBrains图表
+    if derived["jb_installed"]:
+        st.subheader("🔧 JetBrains IDEs")
         
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(figures["jetbrains"], use_container_width=True)
         
         # 显示文件列表
-        if scan_results["jetbrains"]["existing_files"]:
+        if derived["jb_existing"]:
             with st.expander("查看已找到的文件"):
                 for file_path in scan_results["jetbrains"]["existing_files"]:
                     st.text(f"✓ {file_path}")
         
-        if scan_results["jetbrains"]["missing_files"]:
+        if derived["jb_missing"]:
             with st.expander("查看未找到的文件"):
                 for file_path in scan_results["jetbrains"]["missing_files"]:
                     st.text(f"✗ {file_path}")
     
     # 创建VSCode图表
-    if scan_results["vscode"]["installed"]:
+    if derived["vscode_installed"]:
         st.subheader("📝 VSCode 变体")
         
-        # 创建条形图
-        vscode_data = pd.DataFrame({
-            "变体": scan_results["vscode"]["variants_found"],
-            "目录数量": [scan_results["vscode"]["total_directories"]] * len(scan_results["vscode"]["variants_found"])
-        })
-        
-        fig = px.bar(
-            vscode_data,
-            x="变体",
-            y="目录数量",
-            title="VSCode变体分布",
-            color="变体"
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(figures["vscode"], use_container_width=True)
         
         # 显示存储目录
         with st.expander("查看存储目录"):
             for directory in scan_results["vscode"]["storage_directories"][:10]:
                 st.text(f"• {directory}")
             
-            if len(scan_results["vscode"]["storage_directories"]) > 10:
-                st.text(f"... 以及 {len(scan_results['vscode']['storage_directories']) - 10} 个更多目录")
+            if derived["vscode_dir_count"] > 10:
+                st.text(f"... 以及 {derived['vscode_dir_count'] - 10} 个更多目录")
     
     # 创建数据库图表
-    if scan_results["database"]["total_databases"] > 0:
+    if derived["db_total"] > 0:
         st.subheader("🗃️ 数据库")
         
-        # 创建条形图
-        db_data = {
-            "类型": ["可访问", "不可访问"],
-            "数量": [
-                scan_results["database"]["accessible_databases"],
-                scan_results["database"]["total_databases"] - scan_results["database"]["accessible_databases"]
-            ]
-        }
-        
-        fig = px.bar(
-            db_data,
-            x="类型",
-            y="数量",
-            title="数据库可访问性",
-            color="类型",
-            color_discrete_map={"可访问": "#4CAF50", "不可访问": "#F44336"}
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(figures["database"], use_container_width=True)
+
+# 清理结果统计: (显示名称, 结果键, 成功字段, 失败字段)
+CLEAN_RESULT_SPECS = (
+    ("JetBrains", "jetbrains", "files_processed", "errors"),
+    ("VSCode", "vscode", "directories_processed", "errors"),
+    ("数据库", "database", "databases_cleaned", "databases_failed"),
+)
+
+def _safe_count(value):
+    """统计结果字段数量，兼容列表和整数两种形式"""
+    if isinstance(value, list):
+        return len(value)
+    if isinstance(value, int):
+        return value
+    return 0
+
+def _build_clean_figure(clean_results):
+    """根据清理结果构建统计图表，没有数据时返回None"""
+    import pandas as pd
+    import plotly.express as px
+    
+    # 创建清理结果图表
+    results_data = {
+        "类型": [],
+        "成功": [],
+        "失败": []
+    }
+    
+    for label, key, ok_field, fail_field in CLEAN_RESULT_SPECS:
+        result = clean_results[key]
+        if not result:
+            continue
+        results_data["类型"].append(label)
+        results_data["成功"].append(_safe_count(result.get(ok_field)))
+        results_data["失败"].append(_safe_count(result.get(fail_field)))
+    
+    if not results_data["类型"]:
+        return None
+    
+    results_df = pd.DataFrame(results_data)
+    
+    return px.bar(
+        results_df,
+        x="类型",
+        y=["成功", "失败"],
+        title="清理结果统计",
+        barmode="group",
+        color_discrete_map={"成功": "#4CAF50", "失败": "#F44336"}
+    )
 
 def render_clean_results():
     """渲染清理结果"""
@@ -579,88 +710,76 @@ def render_clean_results():
     if clean_results["success"]:
         st.subheader("🎉 清理结果")
         
-        # 创建清理结果图表
-        results_data = {
-            "类型": [],
-            "成功": [],
-            "失败": []
-        }
-        
-        if clean_results["jetbrains"]:
-            results_data["类型"].append("JetBrains")
-            if isinstance(clean_results["jetbrains"]["files_processed"], list):
-                results_data["成功"].append(len(clean_results["jetbrains"]["files_processed"]))
-            else:
-                results_data["成功"].append(0)
-            
-            if isinstance(clean_results["jetbrains"]["errors"], list):
-                results_data["失败"].append(len(clean_results["jetbrains"]["errors"]))
-            else:
-                results_data["失败"].append(0)
-        
-        if clean_results["vscode"]:
-            results_data["类型"].append("VSCode")
-            results_data["成功"].append(len(clean_results["vscode"]["directories_processed"]) if isinstance(clean_results["vscode"]["directories_processed"], list) else 0)
-            results_data["失败"].append(len(clean_results["vscode"]["errors"]) if isinstance(clean_results["vscode"]["errors"], list) else 0)
+        cache = st.session_state._render_cache
+        if "clean_figure" not in cache:
+            cache["clean_figure"] = _build_clean_figure(clean_results)
         
-        if clean_results["database"]:
-            results_data["类型"].append("数据库")
-            results_data["成功"].append(clean_results["database"]["databases_cleaned"] if isinstance(clean_results["database"]["databases_cleaned"], int) else 0)
-            results_data["失败"].append(clean_results["database"]["databases_failed"] if isinstance(clean_results["database"]["databases_failed"], int) else 0)
-        
-        if results_data["类型"]:
-            results_df = pd.DataFrame(results_data)
-            
-            fig = px.bar(
-                results_df,
-                x="类型",
-                y=["成功", "失败"],
-                title="清理结果统计",
-                barmode="group",
-                color_discrete_map={"成功": "#4CAF50", "失败": "#F44336"}
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+        if cache["clean_figure"] is not None:
+            st.plotly_chart(cache["clean_figure"], use_container_width=True)
         
         # 显示备份信息
-        has_backups = False
-        backup_count = 0
-        
-        if clean_results["jetbrains"] and clean_results["jetbrains"].get("backups_created") and isinstance(clean_results["jetbrains"]["backups_created"], list):
-            has_backups = True
-            backup_count += len(clean_results["jetbrains"]["backups_created"])
+        backups = []
+        for label, key, _, _ in CLEAN_RESULT_SPECS:
+            result = clean_results[key]
+            if result and result.get("backups_created") and isinstance(result["backups_created"], list):
+                backups.append((label, result["backups_created"]))
         
-        if clean_results["vscode"] and clean_results["vscode"].get("backups_created") and isinstance(clean_results["vscode"]["backups_created"], list):
-            has_backups = True
-            backup_count += len(clean_results["vscode"]["backups_created"])
-        
-        if clean_results["database"] and clean_results["database"].get("backups_created") and isinstance(clean_results["database"]["backups_created"], list):
-            has_backups = True
-            backup_count += len(clean_results["database"]["backups_created"])
-            
-        if has_backups:
+        if backups:
             st.subheader("💾 备份信息")
             
+            backup_count = sum(len(created) for _, created in backups)
             st.info(f"共创建了 {backup_count} 个备份文件")
             
             with st.expander("查看备份详情"):
-                if clean_results["jetbrains"] and clean_results["jetbrains"].get("backups_created") and isinstance(clean_results["jetbrains"]["backups_created"], list):
-                    st.write("JetBrains备份:")
-                    for backup in clean_results["jetbrains"]["backups_created"]:
-                        st.text(f"• {backup}")
-                
-                if clean_results["vscode"] and clean_results["vscode"].get("backups_created") and isinstance(clean_results["vscode"]["backups_created"], list):
-                    st.write("VSCode备份:")
-                    for backup in clean_results["vscode"]["backups_created"]:
-                        st.text(f"• {backup}")
-                
-                if clean_results["database"] and clean_results["database"].get("backups_created") and isinstance(clean_results["database"]["backups_created"], list):
-                    st.write("数据库备份:")
-                    for backup in clean_results["database"]["backups_created"]:
+                for label, created in backups:
+                    st.write(f"{label}备份:")
+                    for backup in created:
                         st.text(f"• {backup}")
 
+# 自定义CSS（每次重绘都需要重新输出，Streamlit会移除本轮未输出的元素）
+_CSS = """
+<style>
+.main-header {
+    font-size: 2.5rem;
+    color: #1E88E5;
+    text-align: center;
+    margin-bottom: 1rem;
+}
+.sub-header {
+    font-size: 1.2rem;
+    color: #424242;
+    text-align: center;
+    margin-bottom: 2rem;
+}
+.stButton>button {
+    width: 100%;
+}
+.log-container {
+    height: 300px;
+    overflow-y: auto;
+    background-color: #f8f9fa;
+    border-radius: 5px;
+    padding: 10px;
+    font-family: monospace;
+}
+</style>
+"""
+
+def _system_snapshot():
+    """获取系统信息快照"""
+    import psutil
+    
+    return {
+        "操作系统": os.name,
+        "Python版本": sys.version.split()[0],
+        "CPU使用率": f"{psutil.cpu_percent()}%",
+        "内存使用率": f"{psutil.virtual_memory().percent}%"
+    }
+
 def main():
     """主函数"""
+    VERSION, APP_NAME = _load_config()
+    
     # 设置页面配置
     st.set_page_config(
         page_title=f"{APP_NAME} v{VERSION}",
@@ -670,33 +789,7 @@ def main():
     )
     
     # 自定义CSS
-    st.markdown("""
-    <style>
-    .main-header {
-        font-size: 2.5rem;
-        color: #1E88E5;
-        text-align: center;
-        margin-bottom: 1rem;
-    }
-    .sub-header {
-        font-size: 1.2rem;
-        color: #424242;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .stButton>button {
-        width: 100%;
-    }
-    .log-container {
-        height: 300px;
-        overflow-y: auto;
-        background-color: #f8f9fa;
-        border-radius: 5px;
-        padding: 10px;
-        font-family: monospace;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(_CSS, unsafe_allow_html=True)
     
     # 标题
     st.markdown(f'<h1 class="main-header">{APP_NAME} v{VERSION}</h1>', unsafe_allow_html=True)
@@ -750,16 +843,19 @@ def main():
         
         # 系统信息
         st.subheader("💻 系统信息")
-        system_info = {
-            "操作系统": os.name,
-            "Python版本": sys.version.split()[0],
-            "CPU使用率": f"{psutil.cpu_percent()}%",
-            "内存使用率": f"{psutil.virtual_memory().percent}%"
-        }
-        
-        for key, value in system_info.items():
+        for key, value in _system_snapshot().items():
             st.text(f"{key}: {value}")
     
+    # 渲染签名未变化时复用上次构建的日志HTML和图表
+    render_sig = (
+        st.session_state.log_seq,
+        id(st.session_state.scan_results),
+        id(st.session_state.clean_results)
+    )
+    if render_sig != st.session_state._last_render_sig:
+        st.session_state._render_cache = {}
+        st.session_state._last_render_sig = render_sig
+    
     # 中间列 - 日志和结果
     with col2:
         st.subheader("📊 系统状态与日志")
@@ -794,7 +890,11 @@ def main():
         # 显示进度
         if st.session_state.is_cleaning:
             st.subheader("⏳ 清理进度")
-            st.progress(100)
+            progress = st.session_state.clean_progress
+            if progress["total"]:
+                st.progress(progress["done"] / progress["total"], text=f"{progress['stage']}: {progress['done']}/{progress['total']}")
+            else:
+                st.progress(0)
             st.text("清理操作正在进行中...")
         
         # 显示备份位置
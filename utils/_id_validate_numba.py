@@ -0,0 +1,42 @@
+"""
+Numba-compiled hex validation used by IDGenerator.validate_ids_batch
+
+Importing this module raises ImportError when numba is not installed;
+id_generator then falls back to bytes.fromhex per ID.
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def all_hex(buf, off, n):
+    """Return True if buf[off:off + n] contains only ASCII hex digits"""
+    for i in range(off, off + n):
+        c = buf[i]
+        if not ((48 <= c <= 57) or (97 <= c <= 102) or (65 <= c <= 70)):
+            return False
+    return True
+
+
+@njit(cache=True)
+def _hex_runs(buf, width, count):
+    out = np.empty(count, dtype=np.bool_)
+    for k in range(count):
+        out[k] = all_hex(buf, k * width, width)
+    return out
+
+
+def hex_runs(data: bytes, width: int) -> np.ndarray:
+    """
+    Validate consecutive fixed-width fields of an ASCII buffer in one JIT call
+
+    Args:
+        data: Concatenated IDs, each exactly width bytes long
+        width: Length of each ID
+
+    Returns:
+        Boolean array with one entry per ID
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    return _hex_runs(buf, width, len(data) // width)
@@ -2,19 +2,426 @@
 Backup management utilities for safe file operations
 """
 
+import errno
+import fnmatch
+import hashlib
+import mmap
 import os
+import re
 import shutil
+import stat
+import sys
 import time
 import zipfile
+import zlib
 import json
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 import logging
 
-from config.settings import BACKUP_CONFIG
+from config.settings import BACKUP_CONFIG, get_platform_paths
+
+try:
+    import orjson
+
+    def _json_dumps(data: Any) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(data: Any) -> bytes:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+    _json_loads = json.loads
+
+try:
+    # Python 3.14+: zipfile supports Zstandard members (method 93)
+    from compression import zstd as _zstd
+except ImportError:
+    _zstd = None
 
 logger = logging.getLogger(__name__)
 
+_ZIP_ZSTANDARD = getattr(zipfile, "ZIP_ZSTANDARD", None) if _zstd is not None else None
+
+_TIMESTAMP_FORMAT = BACKUP_CONFIG["timestamp_format"]
+_BACKUP_EXTENSION = BACKUP_CONFIG["backup_extension"]
+
+# Trailing "_YYYYMMDD_HHMMSS" timestamp in backup file names
+_TIMESTAMP_RE = re.compile(r'_\d{8}_\d{6}$')
+
+# Backup name prefixes used by the IDE handlers
+_JETBRAINS_PREFIX = "jetbrains_"
+_VSCODE_STORAGE_PREFIX = "vscode_storage_"
+_VSCODE_MACHINE_PREFIX = "vscode_machine_"
+
+
+@lru_cache(maxsize=1)
+def _cached_platform_paths() -> Dict[str, Any]:
+    """Platform paths never change while the process runs, so resolve them once"""
+    return get_platform_paths()
+
+# ioctl(FICLONE) request number from <linux/fs.h>
+_FICLONE = 0x40049409
+
+# Errors meaning "this copy strategy is not available here", not "the copy failed"
+_COPY_FALLBACK_ERRNOS = frozenset(
+    getattr(errno, name) for name in
+    ("EOPNOTSUPP", "ENOTSUP", "EXDEV", "ENOSYS", "EINVAL", "ENOTTY", "EBADF", "ETXTBSY")
+    if hasattr(errno, name)
+)
+
+# Buffer size for userspace copies
+_COPY_BUFSIZE = 1 << 20
+
+_clonefile = None
+
+
+def _macos_clonefile(src: Path, dst: Path) -> bool:
+    """Clone src to a new file dst with clonefile(2); returns False if unsupported"""
+    global _clonefile
+    if _clonefile is None:
+        try:
+            import ctypes
+            libc = ctypes.CDLL(None, use_errno=True)
+            _clonefile = libc.clonefile
+            _clonefile.argtypes = (ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32)
+            _clonefile.restype = ctypes.c_int
+        except (OSError, AttributeError):
+            _clonefile = False
+    if not _clonefile or dst.exists():
+        # clonefile(2) refuses to overwrite an existing destination
+        return False
+    if _clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+        return True
+    import ctypes
+    err = ctypes.get_errno()
+    if err in _COPY_FALLBACK_ERRNOS:
+        return False
+    raise OSError(err, os.strerror(err), str(dst))
+
+
+def _ficlone(src_fd: int, dst_fd: int) -> bool:
+    """Clone src_fd into dst_fd with ioctl(FICLONE); returns False if unsupported"""
+    import fcntl
+
+    try:
+        fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+        return True
+    except OSError as e:
+        if e.errno not in _COPY_FALLBACK_ERRNOS:
+            raise
+        return False
+
+
+def _zero_copy(src_fd: int, dst_fd: int, size: int) -> int:
+    """
+    Copy up to size bytes between two file descriptors without leaving the kernel
+
+    Tries os.copy_file_range, then os.sendfile (Linux).
+
+    Returns:
+        Number of bytes copied; 0 when no in-kernel path is available
+    """
+    copied = 0
+
+    if hasattr(os, "copy_file_range"):
+        try:
+            while copied < size:
+                sent = os.copy_file_range(src_fd, dst_fd, size - copied)
+                if sent == 0:
+                    break
+                copied += sent
+        except OSError as e:
+            if e.errno not in _COPY_FALLBACK_ERRNOS:
+                raise
+
+    if copied < size and sys.platform.startswith("linux"):
+        try:
+            while copied < size:
+                sent = os.sendfile(dst_fd, src_fd, copied, size - copied)
+                if sent == 0:
+                    break
+                copied += sent
+        except OSError as e:
+            if e.errno not in _COPY_FALLBACK_ERRNOS:
+                raise
+
+    return copied
+
+
+def _iter_files(root: Path) -> Iterator[Tuple[str, os.stat_result]]:
+    """
+    Walk a directory tree with os.scandir, yielding (path, stat) for every file
+
+    Reuses the type and stat information cached on each DirEntry instead of
+    issuing separate is_file()/stat() calls. Symlinked directories are not
+    followed.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            yield entry.path, entry.stat()
+                    except OSError as e:
+                        logger.warning(f"Cannot access {entry.path}: {e}")
+        except OSError as e:
+            logger.warning(f"Cannot scan directory {current}: {e}")
+
+
+# Worker threads compressing directory-backup members; zlib releases the GIL
+_ZIP_WORKERS = min(32, os.cpu_count() or 1)
+# Verification is I/O bound, so use more threads than cores to keep the disk queue full
+_VERIFY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+_ZIP_LOCAL_HEADER_MAGIC = b'PK\x03\x04'
+
+# Already-compressed formats; stored as-is since recompressing them gains almost nothing
+_INCOMPRESSIBLE_EXTS = frozenset({
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.zip', '.gz', '.tgz', '.xz', '.bz2', '.7z',
+    '.mp4', '.mp3', '.woff', '.woff2', '.br', '.zst', '.vsix', '.jar',
+})
+
+# Files at least this large are streamed by ZipFile.write on the writer thread
+# instead of being read into memory and compressed by a worker
+_ZIP_INMEMORY_LIMIT = 4 * 1024 * 1024
+# Upper bound on the raw bytes of files queued for or held by compression workers
+_ZIP_INFLIGHT_BYTES = 64 * 1024 * 1024
+
+
+def _zip_compression() -> Tuple[int, int]:
+    """
+    Resolve the configured zip compression method and level
+
+    Zstandard is used when configured and supported by zipfile (Python 3.14+);
+    otherwise DEFLATE is used at the same level.
+
+    Returns:
+        (zipfile compression constant, compression level)
+    """
+    level = BACKUP_CONFIG.get("compression_level", 3)
+    if BACKUP_CONFIG.get("compression") == "zstd" and _ZIP_ZSTANDARD is not None:
+        return _ZIP_ZSTANDARD, level
+    return zipfile.ZIP_DEFLATED, level
+
+
+def _compress_file(file_path: str, st: os.stat_result, compress_type: int,
+                   level: int) -> Tuple[os.stat_result, Optional[Tuple[bytes, int, int]]]:
+    """
+    Read and compress a file for a zip member
+
+    Returns:
+        (stat, (compressed_data, crc32, uncompressed_size)), or (stat, None) when
+        the file is too large and should be streamed instead
+    """
+    if st.st_size >= _ZIP_INMEMORY_LIMIT:
+        return st, None
+
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    if compress_type == zipfile.ZIP_STORED:
+        data = raw
+    elif compress_type == _ZIP_ZSTANDARD:
+        data = _zstd.compress(raw, level=level)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        data = compressor.compress(raw) + compressor.flush()
+    return st, (data, zlib.crc32(raw), len(raw))
+
+
+def _write_compressed_member(zipf: zipfile.ZipFile, arcname: str, st: os.stat_result,
+                             data: bytes, crc: int, size: int, compress_type: int) -> None:
+    """Append an already-compressed member to an open zip file without recompressing it"""
+    zinfo = zipfile.ZipInfo(arcname, date_time=time.localtime(st.st_mtime)[:6])
+    zinfo.external_attr = (st.st_mode & 0xFFFF) << 16
+    zinfo.compress_type = compress_type
+    zinfo.file_size = size
+    zinfo.compress_size = len(data)
+    zinfo.CRC = crc
+    zip64 = max(size, len(data)) > zipfile.ZIP64_LIMIT
+
+    # Mirrors what ZipFile.writestr does once it has the compressed bytes
+    zipf._writecheck(zinfo)
+    zipf._didModify = True
+    zinfo.header_offset = zipf.fp.tell()
+    zipf.fp.write(zinfo.FileHeader(zip64))
+    zipf.fp.write(data)
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+    zipf.start_dir = zipf.fp.tell()
+
+
+def _write_zip_member(zipf: zipfile.ZipFile, dir_path: Path, file_path: str, compress_type: int,
+                      future: Future, failed_files: List[Dict[str, str]]) -> None:
+    """Write one worker result to the zip, recording the file on failure"""
+    try:
+        # Calculate relative path for archive
+        arcname = os.path.relpath(file_path, dir_path)
+        st, compressed = future.result()
+        if compressed is None:
+            zipf.write(file_path, arcname, compress_type=compress_type)
+        else:
+            _write_compressed_member(zipf, arcname, st, *compressed, compress_type)
+    except (OSError, PermissionError, ValueError, zipfile.BadZipFile) as e:
+        failed_files.append({
+            'file': str(file_path),
+            'error': str(e)
+        })
+        logger.warning(f"Failed to backup file {file_path}: {e}")
+
+
+def _sha256(path: Path) -> str:
+    """Return the hex SHA-256 digest of a file"""
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):
+            # Python 3.11+: hashing loop runs in C on the OpenSSL implementation
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap cannot map an empty file
+            return hashlib.sha256().hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.sha256(mm).hexdigest()
+
+
+def _macos_clone(src: Path, dst: Path) -> bool:
+    """
+    Clone src to dst with clonefile(2), replacing dst if it already exists
+
+    clonefile cannot overwrite, so an existing dst is replaced by a clone made
+    next to it and swapped in with os.replace.
+    """
+    if not dst.exists():
+        return _macos_clonefile(src, dst)
+
+    tmp_path = dst.with_name(f".{dst.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.unlink()
+    except FileNotFoundError:
+        pass
+    try:
+        if not _macos_clonefile(src, tmp_path):
+            return False
+        os.replace(tmp_path, dst)
+        return True
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def _fast_copy(src: Path, dst: Path) -> None:
+    """
+    Copy a file with its metadata, like shutil.copy2
+
+    Prefers a copy-on-write clone (clonefile on macOS, FICLONE on Linux) so
+    same-volume copies are a metadata-only operation, then an in-kernel
+    copy via _zero_copy, and otherwise shutil.copyfile, which uses the
+    platform's own fast path (fcopyfile on macOS).
+
+    Args:
+        src: Source file
+        dst: Destination file
+    """
+    if dst.exists() and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src} and {dst} are the same file")
+
+    if not (sys.platform == "darwin" and _macos_clone(src, dst)):
+        src_fd = os.open(src, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            size = os.fstat(src_fd).st_size
+            dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o666)
+            try:
+                if sys.platform.startswith("linux") and _ficlone(src_fd, dst_fd):
+                    copied = size
+                else:
+                    copied = _zero_copy(src_fd, dst_fd, size)
+                if 0 < copied < size:
+                    # The in-kernel copy stopped early; finish the remainder in userspace
+                    os.lseek(src_fd, copied, os.SEEK_SET)
+                    os.lseek(dst_fd, copied, os.SEEK_SET)
+                    with open(src_fd, 'rb', closefd=False) as fsrc, open(dst_fd, 'wb', closefd=False) as fdst:
+                        shutil.copyfileobj(fsrc, fdst, _COPY_BUFSIZE)
+                    copied = size
+            finally:
+                os.close(dst_fd)
+        finally:
+            os.close(src_fd)
+
+        if copied < size:
+            shutil.copyfile(src, dst)
+
+    shutil.copystat(src, dst)
+
+
+def _verify_zip(backup_path: Path) -> bool:
+    """
+    Verify zip structure without decompressing every member
+
+    Each member must have a local file header where the central directory
+    says, and stored members are re-checked against their CRC.
+    """
+    with open(backup_path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+            zipfile.ZipFile(f, 'r') as zipf:
+        for zinfo in zipf.infolist():
+            offset = zinfo.header_offset
+            if mm[offset:offset + 4] != _ZIP_LOCAL_HEADER_MAGIC:
+                logger.error(f"Backup integrity check failed for {backup_path}: "
+                             f"bad local header for {zinfo.filename}")
+                return False
+
+            if zinfo.compress_type == zipfile.ZIP_STORED:
+                crc = 0
+                with zipf.open(zinfo) as fp:
+                    while True:
+                        chunk = fp.read(_COPY_BUFSIZE)
+                        if not chunk:
+                            break
+                        crc = zlib.crc32(chunk, crc)
+                if crc != zinfo.CRC:
+                    logger.error(f"Backup integrity check failed for {backup_path}: "
+                                 f"CRC mismatch for {zinfo.filename}")
+                    return False
+    return True
+
+
+def _verify_json(backup_path: Path) -> bool:
+    """Verify that a JSON backup parses"""
+    with open(backup_path, 'rb') as f:
+        _json_loads(f.read())
+    return True
+
+
+_VERIFY_READ_SIZE = 64 * 1024
+
+
+def _verify_raw(backup_path: Path) -> bool:
+    """Verify a plain file backup: a regular file whose head is readable (empty files are valid)"""
+    st = os.stat(backup_path)
+    if not stat.S_ISREG(st.st_mode):
+        return False
+    # Read the first 64 KiB so a damaged header surfaces without scanning the whole file
+    with open(backup_path, 'rb') as f:
+        return len(f.read(_VERIFY_READ_SIZE)) == min(st.st_size, _VERIFY_READ_SIZE)
+
+
+# Integrity check per backup file suffix; anything else is treated as a raw file copy
+_VERIFIERS = {
+    '.zip': _verify_zip,
+    '.json': _verify_json,
+}
+
 
 class BackupManager:
     """Manages backup operations for files and directories"""
@@ -26,35 +433,101 @@ class BackupManager:
         Args:
             backup_dir: Custom backup directory (optional)
         """
-        if backup_dir:
-            self.backup_dir = Path(backup_dir)
-        else:
-            # Default backup directory in project directory to avoid permission issues
-            try:
-                # Try user's home directory first
-                self.backup_dir = Path.home() / ".augment_cleaner_backups"
-                self.backup_dir.mkdir(parents=True, exist_ok=True)
-                # Test write permission
-                test_file = self.backup_dir / "test_write.tmp"
-                test_file.write_text("test")
-                test_file.unlink()
-            except (PermissionError, OSError):
-                # Fallback to project directory if home directory has permission issues
-                project_root = Path(__file__).parent.parent
-                self.backup_dir = project_root / "backups"
-                logger.warning("Using project directory for backups due to permission issues")
+        self.backup_dir = Path(backup_dir) if backup_dir else self._resolve_backup_dir()
 
         # Ensure backup directory exists
         self.backup_dir.mkdir(parents=True, exist_ok=True)
         logger.info(f"Backup directory: {self.backup_dir}")
+
+        # In-memory metadata of backup files (name -> (mtime, size)), filled by the first scan
+        self._index: Optional[Dict[str, Tuple[float, int]]] = None
+
+        # Content-addressed store; file backups are hard links to objects/<sha256>
+        self._cas_dir = self.backup_dir / "objects"
+        self._deduplicate = BACKUP_CONFIG.get("deduplicate", True)
+
+    @classmethod
+    def _resolve_backup_dir(cls) -> Path:
+        """
+        Choose the default backup directory
+
+        Returns:
+            ~/.augment_cleaner_backups if it can be created and written to,
+            otherwise the project's backups directory
+        """
+        home_dir = Path.home() / ".augment_cleaner_backups"
+        try:
+            home_dir.mkdir(parents=True, exist_ok=True)
+            if sys.platform == "win32":
+                # os.access ignores ACLs on Windows, so only a real write proves access
+                test_file = home_dir / "test_write.tmp"
+                test_file.write_bytes(b"")
+                test_file.unlink()
+                return home_dir
+            if os.access(home_dir, os.W_OK):
+                return home_dir
+        except OSError:
+            pass
+        # Fallback to project directory if home directory has permission issues
+        logger.warning("Using project directory for backups due to permission issues")
+        return Path(__file__).parent.parent / "backups"
+
+    def _load_index(self) -> Dict[str, Tuple[float, int]]:
+        """
+        Scan the backup directory, reusing cached metadata for known names
+
+        Backup files are written once under timestamped names, so only names
+        not seen before need a stat. Files removed by hand, or added by another
+        process, show up in the scan itself.
+        """
+        known = self._index or {}
+        index = {}
+        try:
+            with os.scandir(self.backup_dir) as it:
+                for entry in it:
+                    if not entry.is_file():
+                        continue
+                    meta = known.get(entry.name)
+                    if meta is None:
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        meta = (st.st_mtime, st.st_size)
+                    index[entry.name] = meta
+        except OSError as e:
+            logger.error(f"Failed to scan backup directory {self.backup_dir}: {e}")
+            return {}
+
+        self._index = index
+        return index
+
+    def _index_add(self, backup_path: Path) -> None:
+        """Remember a new backup's metadata so the next rescan does not stat it"""
+        if self._index is None:
+            return
+        try:
+            st = os.stat(backup_path)
+        except OSError:
+            return
+        self._index[backup_path.name] = (st.st_mtime, st.st_size)
+
+    def _index_remove(self, names: List[str]) -> None:
+        """Forget deleted backup files"""
+        if self._index is None:
+            return
+        for name in names:
+            self._index.pop(name, None)
     
-    def create_file_backup(self, file_path: Path, backup_name: Optional[str] = None) -> Optional[Path]:
+    def create_file_backup(self, file_path: Path, backup_name: Optional[str] = None,
+                           timestamp: Optional[str] = None) -> Optional[Path]:
         """
         Create a backup of a single file
         
         Args:
             file_path: Path to file to backup
             backup_name: Custom backup name (optional)
+            timestamp: Timestamp to use in the backup name (optional, defaults to now)
             
         Returns:
             Path to backup file or None if backup failed
@@ -65,17 +538,20 @@ class BackupManager:
         
         try:
             # Generate backup filename
-            timestamp = time.strftime(BACKUP_CONFIG["timestamp_format"])
+            if timestamp is None:
+                timestamp = time.strftime(_TIMESTAMP_FORMAT)
             if backup_name:
-                backup_filename = f"{backup_name}_{timestamp}{BACKUP_CONFIG['backup_extension']}"
+                backup_filename = f"{backup_name}_{timestamp}{_BACKUP_EXTENSION}"
             else:
-                backup_filename = f"{file_path.name}_{timestamp}{BACKUP_CONFIG['backup_extension']}"
+                backup_filename = f"{file_path.name}_{timestamp}{_BACKUP_EXTENSION}"
             
             backup_path = self.backup_dir / backup_filename
             
             # Copy file to backup location
-            shutil.copy2(file_path, backup_path)
+            if not (self._deduplicate and self._link_from_store(file_path, backup_path)):
+                _fast_copy(file_path, backup_path)
             
+            self._index_add(backup_path)
             logger.info(f"Created backup: {file_path} -> {backup_path}")
             return backup_path
             
@@ -83,13 +559,74 @@ class BackupManager:
             logger.error(f"Failed to create backup for {file_path}: {e}")
             return None
     
-    def create_directory_backup(self, dir_path: Path, backup_name: Optional[str] = None) -> Optional[Path]:
+    def _link_from_store(self, file_path: Path, backup_path: Path) -> bool:
+        """
+        Create backup_path as a hard link to the content-addressed copy of file_path
+
+        Identical content is stored once under objects/<sha256>, so repeated
+        backups of an unchanged file take no extra space. The backup stays a
+        normal file that can be copied back by hand.
+
+        Returns:
+            True if the link was created, False if hard links are unsupported
+            (deduplication is then disabled for this manager)
+        """
+        # Copy first (a reflink where supported) and hash only the copy, so the
+        # object is named after exactly the bytes it holds
+        self._cas_dir.mkdir(exist_ok=True)
+        tmp_path = self._cas_dir / f".incoming.{os.getpid()}.tmp"
+        try:
+            _fast_copy(file_path, tmp_path)
+            object_path = self._cas_dir / _sha256(tmp_path)
+            if object_path.exists():
+                tmp_path.unlink()
+            else:
+                os.replace(tmp_path, object_path)
+        except BaseException:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            raise
+
+        if backup_path.exists():
+            backup_path.unlink()
+        try:
+            os.link(object_path, backup_path)
+        except OSError as e:
+            logger.debug(f"Hard links unavailable in {self.backup_dir}, disabling deduplication: {e}")
+            self._deduplicate = False
+            return False
+        return True
+
+    def _prune_store(self) -> int:
+        """Delete stored objects no longer referenced by any backup file"""
+        pruned = 0
+        try:
+            with os.scandir(self._cas_dir) as it:
+                for entry in it:
+                    try:
+                        # Only the store's own link left: no backup refers to it
+                        if entry.is_file(follow_symlinks=False) and entry.stat().st_nlink <= 1:
+                            os.unlink(entry.path)
+                            pruned += 1
+                    except OSError as e:
+                        logger.warning(f"Failed to prune backup object {entry.path}: {e}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to scan backup object store: {e}")
+        return pruned
+
+    def create_directory_backup(self, dir_path: Path, backup_name: Optional[str] = None,
+                                timestamp: Optional[str] = None) -> Optional[Path]:
         """
         Create a compressed backup of a directory
         
         Args:
             dir_path: Path to directory to backup
             backup_name: Custom backup name (optional)
+            timestamp: Timestamp to use in the backup name (optional, defaults to now)
             
         Returns:
             Path to backup zip file or None if backup failed
@@ -100,7 +637,8 @@ class BackupManager:
         
         try:
             # Generate backup filename
-            timestamp = time.strftime(BACKUP_CONFIG["timestamp_format"])
+            if timestamp is None:
+                timestamp = time.strftime(_TIMESTAMP_FORMAT)
             if backup_name:
                 backup_filename = f"{backup_name}_{timestamp}.zip"
             else:
@@ -110,27 +648,41 @@ class BackupManager:
             
             # Create zip backup
             failed_files = []
-            with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for file_path in dir_path.rglob('*'):
-                    if file_path.is_file():
-                        try:
-                            # Calculate relative path for archive
-                            arcname = file_path.relative_to(dir_path)
-                            zipf.write(file_path, str(arcname))
-                        except (OSError, PermissionError, zipfile.BadZipFile) as e:
-                            failed_files.append({
-                                'file': str(file_path),
-                                'error': str(e)
-                            })
-                            logger.warning(f"Failed to backup file {file_path}: {e}")
+            compress_type, level = _zip_compression()
+            with zipfile.ZipFile(backup_path, 'w', compress_type, compresslevel=level) as zipf, \
+                    ThreadPoolExecutor(max_workers=_ZIP_WORKERS) as executor:
+                # Workers compress ahead of the writer; members are written in walk order.
+                # Read-ahead is capped both by member count and by in-memory bytes.
+                pending = deque()
+                inflight_bytes = 0
+                for file_path, st in _iter_files(dir_path):
+                    if os.path.splitext(file_path)[1].lower() in _INCOMPRESSIBLE_EXTS:
+                        member_type = zipfile.ZIP_STORED
+                    else:
+                        member_type = compress_type
+                    # Large files are streamed by the writer and hold no worker memory
+                    size = st.st_size if st.st_size < _ZIP_INMEMORY_LIMIT else 0
+                    while pending and (len(pending) >= _ZIP_WORKERS * 2
+                                       or inflight_bytes + size > _ZIP_INFLIGHT_BYTES):
+                        done_path, done_type, done_size, done_future = pending.popleft()
+                        _write_zip_member(zipf, dir_path, done_path, done_type, done_future, failed_files)
+                        inflight_bytes -= done_size
+                    pending.append((file_path, member_type, size,
+                                    executor.submit(_compress_file, file_path, st, member_type, level)))
+                    inflight_bytes += size
+                while pending:
+                    done_path, done_type, _, done_future = pending.popleft()
+                    _write_zip_member(zipf, dir_path, done_path, done_type, done_future, failed_files)
             
             if failed_files:
                 # Save failed files list
                 failed_files_path = backup_path.with_suffix('.failed.json')
                 with open(failed_files_path, 'w', encoding='utf-8') as f:
                     json.dump(failed_files, f, indent=2)
+                self._index_add(failed_files_path)
                 logger.warning(f"Some files failed to backup, see: {failed_files_path}")
             
+            self._index_add(backup_path)
             logger.info(f"Created directory backup: {dir_path} -> {backup_path}")
             return backup_path
             
@@ -138,32 +690,66 @@ class BackupManager:
             logger.error(f"Failed to create directory backup for {dir_path}: {e}")
             return None
     
-    def create_json_backup(self, data: Dict[str, Any], backup_name: str) -> Optional[Path]:
+    def create_json_backup(self, data: Dict[str, Any], backup_name: str,
+                           timestamp: Optional[str] = None) -> Optional[Path]:
         """
         Create a backup of JSON data
         
         Args:
             data: Data to backup
             backup_name: Name for the backup file
+            timestamp: Timestamp to use in the backup name (optional, defaults to now)
             
         Returns:
             Path to backup file or None if backup failed
         """
         try:
-            timestamp = time.strftime(BACKUP_CONFIG["timestamp_format"])
+            if timestamp is None:
+                timestamp = time.strftime(_TIMESTAMP_FORMAT)
             backup_filename = f"{backup_name}_{timestamp}.json"
             backup_path = self.backup_dir / backup_filename
             
-            with open(backup_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            payload = _json_dumps(data)
+            with open(backup_path, 'wb') as f:
+                f.write(payload)
             
+            self._index_add(backup_path)
             logger.info(f"Created JSON backup: {backup_path}")
             return backup_path
             
-        except (OSError, IOError, json.JSONEncodeError) as e:
+        except (OSError, IOError, TypeError, ValueError) as e:
             logger.error(f"Failed to create JSON backup '{backup_name}': {e}")
             return None
     
+    def backup_batch(self, paths: List[Path]) -> Dict[Path, Optional[Path]]:
+        """
+        Back up several files and directories under one shared timestamp
+
+        Files get a file backup and directories a zip backup. When several
+        paths share a name, the parent directory name is prefixed so their
+        backups do not overwrite each other.
+
+        Args:
+            paths: Files and directories to backup
+
+        Returns:
+            Dictionary mapping each path to its backup path (None if it failed)
+        """
+        timestamp = time.strftime(_TIMESTAMP_FORMAT)
+        name_counts: Dict[str, int] = {}
+        for path in paths:
+            name_counts[path.name] = name_counts.get(path.name, 0) + 1
+
+        results = {}
+        for path in paths:
+            backup_name = f"{path.parent.name}_{path.name}" if name_counts[path.name] > 1 else None
+            if path.is_dir():
+                results[path] = self.create_directory_backup(path, backup_name, timestamp=timestamp)
+            else:
+                results[path] = self.create_file_backup(path, backup_name, timestamp=timestamp)
+
+        return results
+
     def restore_file_backup(self, backup_path: Path, target_path: Path) -> bool:
         """
         Restore a file from backup
@@ -184,7 +770,7 @@ class BackupManager:
             target_path.parent.mkdir(parents=True, exist_ok=True)
 
             # Copy backup to target location
-            shutil.copy2(backup_path, target_path)
+            _fast_copy(backup_path, target_path)
 
             logger.info(f"Restored backup: {backup_path} -> {target_path}")
             return True
@@ -263,28 +849,25 @@ class BackupManager:
             backup_name = backup_path.stem  # Remove .bak extension
 
             # Remove timestamp (format: YYYYMMDD_HHMMSS)
-            import re
-            timestamp_pattern = r'_\d{8}_\d{6}$'
-            original_name = re.sub(timestamp_pattern, '', backup_name)
+            original_name = _TIMESTAMP_RE.sub('', backup_name)
 
             # Map common backup prefixes to original paths
-            from config.settings import get_platform_paths
-            platform_paths = get_platform_paths()
+            platform_paths = _cached_platform_paths()
 
-            if original_name.startswith('jetbrains_'):
+            if original_name.startswith(_JETBRAINS_PREFIX):
                 # JetBrains ID files
-                file_name = original_name.replace('jetbrains_', '')
+                file_name = original_name.replace(_JETBRAINS_PREFIX, '')
                 jetbrains_dir = Path(platform_paths["config"]) / "JetBrains"
                 return jetbrains_dir / file_name
 
-            elif original_name.startswith('vscode_storage_'):
+            elif original_name.startswith(_VSCODE_STORAGE_PREFIX):
                 # VSCode storage files
-                variant_name = original_name.replace('vscode_storage_', '')
+                variant_name = original_name.replace(_VSCODE_STORAGE_PREFIX, '')
                 # This is more complex as we need to find the right VSCode variant
                 # For now, return None to indicate manual restore needed
                 return None
 
-            elif original_name.startswith('vscode_machine_'):
+            elif original_name.startswith(_VSCODE_MACHINE_PREFIX):
                 # VSCode machine ID files
                 return None  # Complex path resolution needed
 
@@ -300,34 +883,31 @@ class BackupManager:
         """
         List available backup files
         
+        Only backups not seen by an earlier listing are stat'ed.
+        
         Args:
             pattern: Optional pattern to filter backups
             
         Returns:
             List of backup file paths
         """
-        try:
-            if pattern:
-                backups = list(self.backup_dir.glob(f"*{pattern}*"))
-            else:
-                backups = list(self.backup_dir.glob("*"))
-            
-            # Filter only files and sort by modification time (newest first)
-            backups = [b for b in backups if b.is_file()]
-            backups.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-            
-            return backups
-            
-        except OSError as e:
-            logger.error(f"Failed to list backups: {e}")
-            return []
+        name_pattern = f"*{pattern}*" if pattern else "*"
+        
+        backups = [(mtime, name) for name, (mtime, _) in self._load_index().items()
+                   if fnmatch.fnmatch(name, name_pattern)]
+        
+        # Sort by modification time (newest first)
+        backups.sort(key=lambda item: item[0], reverse=True)
+        
+        return [self.backup_dir / name for _, name in backups]
     
-    def cleanup_old_backups(self, max_backups: Optional[int] = None) -> int:
+    def cleanup_old_backups(self, max_backups: Optional[int] = None, verify: bool = False) -> int:
         """
         Clean up old backup files, keeping only the most recent ones
         
         Args:
             max_backups: Maximum number of backups to keep (uses config default if None)
+            verify: Check the integrity of the remaining backups afterwards
             
         Returns:
             Number of backups deleted
@@ -343,15 +923,30 @@ class BackupManager:
         # Delete oldest backups
         backups_to_delete = backups[max_backups:]
         deleted_count = 0
+        removed = []
         
         for backup_path in backups_to_delete:
             try:
                 backup_path.unlink()
                 deleted_count += 1
+                removed.append(backup_path.name)
                 logger.debug(f"Deleted old backup: {backup_path}")
+            except FileNotFoundError:
+                # Already gone; just drop the stale index entry
+                removed.append(backup_path.name)
             except OSError as e:
                 logger.warning(f"Failed to delete old backup {backup_path}: {e}")
         
+        if removed:
+            self._index_remove(removed)
+            self._prune_store()
+        
+        if verify:
+            corrupted = [path for path, ok in self.verify_all(backups[:max_backups]).items() if not ok]
+            if corrupted:
+                logger.warning(f"{len(corrupted)} remaining backups failed verification: "
+                               f"{', '.join(p.name for p in corrupted)}")
+        
         if deleted_count > 0:
             logger.info(f"Cleaned up {deleted_count} old backup files")
         
@@ -367,21 +962,21 @@ class BackupManager:
         Returns:
             Dictionary with backup information
         """
-        if not backup_path.exists():
-            return {}
-        
         try:
             stat = backup_path.stat()
-            return {
-                "path": str(backup_path),
-                "size": stat.st_size,
-                "created": time.ctime(stat.st_ctime),
-                "modified": time.ctime(stat.st_mtime),
-                "is_compressed": backup_path.suffix.lower() == '.zip',
-            }
+        except FileNotFoundError:
+            return {}
         except OSError as e:
             logger.error(f"Failed to get backup info for {backup_path}: {e}")
             return {}
+        
+        return {
+            "path": str(backup_path),
+            "size": stat.st_size,
+            "created": time.ctime(stat.st_ctime),
+            "modified": time.ctime(stat.st_mtime),
+            "is_compressed": backup_path.suffix.lower() == '.zip',
+        }
     
     def verify_backup_integrity(self, backup_path: Path) -> bool:
         """
@@ -397,23 +992,25 @@ class BackupManager:
             return False
         
         try:
-            if backup_path.suffix.lower() == '.zip':
-                # Verify zip file integrity
-                with zipfile.ZipFile(backup_path, 'r') as zipf:
-                    # Test the zip file
-                    zipf.testzip()
-                return True
-            elif backup_path.suffix.lower() == '.json':
-                # Verify JSON file integrity
-                with open(backup_path, 'r', encoding='utf-8') as f:
-                    json.load(f)
-                return True
-            else:
-                # For other files, just check if readable
-                with open(backup_path, 'rb') as f:
-                    f.read(1024)  # Read first 1KB to test
-                return True
-                
-        except (OSError, IOError, zipfile.BadZipFile, json.JSONDecodeError) as e:
+            verifier = _VERIFIERS.get(backup_path.suffix.lower(), _verify_raw)
+            return verifier(backup_path)
+        except (OSError, IOError, ValueError, zipfile.BadZipFile, json.JSONDecodeError) as e:
             logger.error(f"Backup integrity check failed for {backup_path}: {e}")
             return False
+
+    def verify_all(self, paths: List[Path]) -> Dict[Path, bool]:
+        """
+        Verify many backups concurrently
+        
+        Args:
+            paths: Backup files to check
+            
+        Returns:
+            Mapping of each path to its verify_backup_integrity result
+        """
+        paths = [Path(p) for p in paths]
+        if len(paths) <= 1:
+            return {p: self.verify_backup_integrity(p) for p in paths}
+        
+        with ThreadPoolExecutor(max_workers=min(_VERIFY_WORKERS, len(paths))) as executor:
+            return dict(zip(paths, executor.map(self.verify_backup_integrity, paths)))
@@ -7,7 +7,7 @@ import stat
 import subprocess
 import sys
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, Iterable, List, Dict
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,6 +16,9 @@ logger = logging.getLogger(__name__)
 class FileLockManager:
     """Manages file locking operations across different platforms"""
     
+    # Maximum number of paths passed to a single chflags invocation (keeps argv under ARG_MAX)
+    _BATCH_SIZE = 500
+    
     @staticmethod
     def lock_file(file_path: Path) -> bool:
         """
@@ -31,126 +34,7 @@ class FileLockManager:
             logger.error(f"Cannot lock file that doesn't exist: {file_path}")
             return False
         
-        try:
-            logger.info(f"Locking file: {file_path}")
-            
-            # Use platform-specific locking methods
-            success = False
-            
-            if sys.platform == "win32":
-                success = FileLockManager._lock_file_windows(file_path)
-            elif sys.platform == "darwin":
-                success = FileLockManager._lock_file_macos(file_path)
-            else:
-                success = FileLockManager._lock_file_linux(file_path)
-            
-            # Always ensure file is read-only using Python API as fallback
-            try:
-                perms = file_path.stat().st_mode
-                file_path.chmod(perms & ~stat.S_IWUSR & ~stat.S_IWGRP & ~stat.S_IWOTH)
-                logger.debug(f"Set read-only permissions for: {file_path}")
-            except OSError as e:
-                logger.warning(f"Failed to set read-only permissions for {file_path}: {e}")
-            
-            if success:
-                logger.info(f"Successfully locked file: {file_path}")
-            else:
-                logger.warning(f"File locking may not be fully effective for: {file_path}")
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to lock file {file_path}: {e}")
-            return False
-    
-    @staticmethod
-    def _lock_file_windows(file_path: Path) -> bool:
-        """Lock file on Windows using attrib command"""
-        try:
-            # Use attrib command to set read-only attribute
-            result = subprocess.run(
-                ["attrib", "+R", str(file_path)],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                logger.debug(f"Windows attrib command successful for: {file_path}")
-                return True
-            else:
-                logger.warning(f"Windows attrib command failed for {file_path}: {result.stderr}")
-                return False
-                
-        except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError) as e:
-            logger.warning(f"Windows file locking command failed for {file_path}: {e}")
-            return False
-    
-    @staticmethod
-    def _lock_file_macos(file_path: Path) -> bool:
-        """Lock file on macOS using chmod and chflags"""
-        success = True
-        
-        try:
-            # Set read-only permissions
-            result = subprocess.run(
-                ["chmod", "444", str(file_path)],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode != 0:
-                logger.warning(f"macOS chmod command failed for {file_path}: {result.stderr}")
-                success = False
-            else:
-                logger.debug(f"macOS chmod command successful for: {file_path}")
-            
-        except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError) as e:
-            logger.warning(f"macOS chmod command failed for {file_path}: {e}")
-            success = False
-        
-        try:
-            # Set immutable flag
-            result = subprocess.run(
-                ["chflags", "uchg", str(file_path)],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode != 0:
-                logger.warning(f"macOS chflags command failed for {file_path}: {result.stderr}")
-            else:
-                logger.debug(f"macOS chflags command successful for: {file_path}")
-                
-        except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError) as e:
-            logger.warning(f"macOS chflags command failed for {file_path}: {e}")
-        
-        return success
-    
-    @staticmethod
-    def _lock_file_linux(file_path: Path) -> bool:
-        """Lock file on Linux using chmod"""
-        try:
-            # Set read-only permissions
-            result = subprocess.run(
-                ["chmod", "444", str(file_path)],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                logger.debug(f"Linux chmod command successful for: {file_path}")
-                return True
-            else:
-                logger.warning(f"Linux chmod command failed for {file_path}: {result.stderr}")
-                return False
-                
-        except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError) as e:
-            logger.warning(f"Linux file locking command failed for {file_path}: {e}")
-            return False
+        return FileLockManager.lock_paths([file_path])[file_path]
     
     @staticmethod
     def unlock_file(file_path: Path) -> bool:
@@ -248,37 +132,16 @@ class FileLockManager:
         
         try:
             # Restore write permissions
-            result = subprocess.run(
-                ["chmod", "644", str(file_path)],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode != 0:
-                logger.warning(f"macOS chmod unlock failed for {file_path}: {result.stderr}")
-                # 尝试使用sudo（仅用于日志记录，不实际执行）
-                logger.warning(f"可能需要管理员权限，请尝试: sudo chmod 644 {file_path}")
-                success = False
-            else:
-                logger.debug(f"macOS chmod unlock successful for: {file_path}")
-            
-        except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError) as e:
-            logger.warning(f"macOS chmod unlock command failed for {file_path}: {e}")
+            os.chmod(file_path, 0o644)
+            logger.debug(f"macOS chmod unlock successful for: {file_path}")
+        except PermissionError:
+            logger.warning(f"权限不足，无法修改文件: {file_path}")
+            # 尝试使用sudo（仅用于日志记录，不实际执行）
+            logger.warning(f"可能需要管理员权限，请尝试: sudo chmod 644 {file_path}")
+            success = False
+        except OSError as e:
+            logger.warning(f"macOS chmod unlock failed for {file_path}: {e}")
             success = False
-        
-        # 如果上述方法都失败，尝试使用Python的内置方法
-        if not success:
-            try:
-                # 尝试使用Python的os模块修改权限
-                os.chmod(file_path, 0o644)
-                logger.info(f"使用Python内置方法成功解锁文件: {file_path}")
-                success = True
-            except PermissionError:
-                logger.warning(f"权限不足，无法修改文件: {file_path}")
-                logger.warning(f"请尝试以管理员/sudo权限运行程序")
-            except Exception as e:
-                logger.warning(f"Python内置解锁方法失败: {e}")
         
         return success
     
@@ -287,22 +150,11 @@ class FileLockManager:
         """Unlock file on Linux using chmod"""
         try:
             # Restore write permissions
-            result = subprocess.run(
-                ["chmod", "644", str(file_path)],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                logger.debug(f"Linux chmod unlock successful for: {file_path}")
-                return True
-            else:
-                logger.warning(f"Linux chmod unlock failed for {file_path}: {result.stderr}")
-                return False
-                
-        except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError) as e:
-            logger.warning(f"Linux file unlocking command failed for {file_path}: {e}")
+            os.chmod(file_path, 0o644)
+            logger.debug(f"Linux chmod unlock successful for: {file_path}")
+            return True
+        except OSError as e:
+            logger.warning(f"Linux file unlocking failed for {file_path}: {e}")
             return False
     
     @staticmethod
@@ -339,15 +191,71 @@ class FileLockManager:
         Args:
             file_paths: List of file paths to lock
             
+        Returns:
+            Dictionary mapping file paths to success status
+        """
+        return FileLockManager.lock_paths(file_paths)
+    
+    @staticmethod
+    def lock_paths(paths: Iterable[Path], mode: int = 0o444) -> Dict[Path, bool]:
+        """
+        Set permissions on many files with one os.chmod call each
+        
+        No process is spawned per file and only a single summary line is
+        logged; on macOS read-only modes also get the immutable flag through
+        batched chflags invocations.
+        
+        Args:
+            paths: File paths to lock
+            mode: Permission bits to apply (read-only by default)
+            
         Returns:
             Dictionary mapping file paths to success status
         """
         results = {}
+        locked = []
+        failures = []
+        debug = logger.isEnabledFor(logging.DEBUG)
         
-        for file_path in file_paths:
-            results[file_path] = FileLockManager.lock_file(file_path)
+        for path in paths:
+            try:
+                # On Windows os.chmod maps 0o444 to the read-only attribute
+                os.chmod(path, mode)
+                results[path] = True
+                locked.append(path)
+                if debug:
+                    logger.debug(f"chmod {mode:o} successful for: {path}")
+            except OSError as e:
+                results[path] = False
+                failures.append((path, e))
+        
+        if sys.platform == "darwin" and not mode & 0o222:
+            batch_size = FileLockManager._BATCH_SIZE
+            for start in range(0, len(locked), batch_size):
+                batch = [str(p) for p in locked[start:start + batch_size]]
+                try:
+                    result = subprocess.run(
+                        ["chflags", "uchg", *batch],
+                        capture_output=True,
+                        text=True,
+                        timeout=10
+                    )
+                    if result.returncode != 0:
+                        logger.warning(f"macOS chflags command failed for {len(batch)} files: {result.stderr}")
+                except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError) as e:
+                    logger.warning(f"macOS chflags command failed for {len(batch)} files: {e}")
         
-        successful_locks = sum(1 for success in results.values() if success)
-        logger.info(f"Successfully locked {successful_locks}/{len(file_paths)} files")
+        if len(results) == 1:
+            # Single-file locks name the file, as lock_file always has
+            if failures:
+                path, error = failures[0]
+                logger.error(f"Failed to lock file {path}: {error}")
+            else:
+                logger.info(f"Successfully locked file: {locked[0]}")
+        elif failures:
+            failed = "; ".join(f"{path} ({error})" for path, error in failures)
+            logger.warning(f"Locked {len(locked)}/{len(results)} files; failed: {failed}")
+        else:
+            logger.info(f"Successfully locked {len(locked)}/{len(results)} files")
         
         return results
@@ -2,15 +2,64 @@
 ID generation utilities for creating new device and machine IDs
 """
 
-import uuid
+import os
+import re
 import secrets
 import hashlib
-import base64
-from typing import Dict, Any
+import time
+from typing import Dict, Any, List
 import logging
 
+try:
+    # SIMD-accelerated decoder; same API as the stdlib function
+    from pybase64 import b64decode as _b64decode
+except ImportError:
+    from base64 import b64decode as _b64decode
+
 logger = logging.getLogger(__name__)
 
+# Random bytes consumed by one generate_telemetry_ids call: machine ID, three UUIDs, hash seed
+_MACHINE_ID_BYTES = 32
+_UUID_BYTES = 16
+_TELEMETRY_RANDOM_BYTES = _MACHINE_ID_BYTES + 3 * _UUID_BYTES + 16
+
+# Below this many IDs the JIT call and buffer building cost more than bytes.fromhex per ID
+_NUMBA_BATCH_THRESHOLD = 256
+
+_UUID_RE = re.compile(
+    r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'
+)
+
+
+def _is_hex_digest(value: str) -> bool:
+    """Check for a 64-character hex string (32 bytes)"""
+    if len(value) != 64:
+        return False
+    try:
+        # fromhex skips whitespace, so also check the decoded length
+        return len(bytes.fromhex(value)) == 32
+    except ValueError:
+        return False
+
+
+def _generate_hex_hash(seed: bytes) -> str:
+    """
+    Hash random bytes into a 64-character hex string for SHA-256 formatted fields
+
+    The seed is already random, so only the output format matters; BLAKE2b is
+    faster than SHA-256 in software and hashlib always provides it.
+    """
+    return hashlib.blake2b(seed, digest_size=32).hexdigest()
+
+
+def _uuid4_from_bytes(raw: bytes) -> str:
+    """Format 16 random bytes as a lowercase UUID v4 string"""
+    b = bytearray(raw)
+    b[6] = (b[6] & 0x0F) | 0x40  # version 4
+    b[8] = (b[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = b.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
 
 class IDGenerator:
     """Generates various types of IDs for telemetry replacement"""
@@ -27,9 +76,8 @@ class IDGenerator:
             Decoded string
         """
         try:
-            decoded_bytes = base64.b64decode(encoded_str)
-            decoded_str = decoded_bytes.decode('utf-8')
-            logger.debug(f"Decoded Base64: {encoded_str} -> {decoded_str}")
+            decoded_str = _b64decode(encoded_str).decode('utf-8')
+            logger.debug("Decoded Base64: %s -> %s", encoded_str, decoded_str)
             return decoded_str
         except Exception as e:
             logger.error(f"Failed to decode Base64 string {encoded_str}: {e}")
@@ -43,8 +91,8 @@ class IDGenerator:
         Returns:
             Lowercase UUID v4 string
         """
-        new_uuid = str(uuid.uuid4()).lower()
-        logger.debug(f"Generated UUID: {new_uuid}")
+        new_uuid = _uuid4_from_bytes(os.urandom(_UUID_BYTES))
+        logger.debug("Generated UUID: %s", new_uuid)
         return new_uuid
     
     @staticmethod
@@ -59,9 +107,29 @@ class IDGenerator:
         # Generate 32 random bytes (which will become 64 hex characters)
         random_bytes = secrets.token_bytes(32)
         machine_id = random_bytes.hex()
-        logger.debug(f"Generated machine ID: {machine_id}")
+        logger.debug("Generated machine ID: %s", machine_id)
         return machine_id
     
+    @staticmethod
+    def generate_machine_ids(n: int) -> List[str]:
+        """
+        Generate several machine IDs from one random draw
+        
+        Args:
+            n: Number of IDs to generate
+            
+        Returns:
+            List of 64-character hexadecimal strings
+        """
+        if n <= 0:
+            return []
+        # Hex-encode the whole buffer once, then slice it into IDs
+        hex_str = os.urandom(_MACHINE_ID_BYTES * n).hex()
+        width = _MACHINE_ID_BYTES * 2
+        machine_ids = [hex_str[i:i + width] for i in range(0, len(hex_str), width)]
+        logger.debug("Generated %d machine IDs", n)
+        return machine_ids
+    
     @staticmethod
     def generate_device_id() -> str:
         """
@@ -71,22 +139,20 @@ class IDGenerator:
             Lowercase UUID v4 string
         """
         device_id = IDGenerator.generate_uuid()
-        logger.debug(f"Generated device ID: {device_id}")
+        logger.debug("Generated device ID: %s", device_id)
         return device_id
     
     @staticmethod
     def generate_sha256_hash() -> str:
         """
-        Generate a SHA-256 hash from a random UUID
-        Some telemetry fields require SHA-256 hashes instead of plain UUIDs
+        Generate a 64-character hash string from 16 random bytes
+        Some telemetry fields require SHA-256 formatted hashes instead of plain UUIDs
         
         Returns:
-            64-character SHA-256 hash string
+            64-character hex hash string
         """
-        # Generate a random UUID and hash it
-        random_uuid = uuid.uuid4()
-        sha256_hash = hashlib.sha256(random_uuid.bytes).hexdigest()
-        logger.debug(f"Generated SHA-256 hash: {sha256_hash}")
+        sha256_hash = _generate_hex_hash(os.urandom(16))
+        logger.debug("Generated SHA-256 hash: %s", sha256_hash)
         return sha256_hash
     
     @staticmethod
@@ -97,17 +163,26 @@ class IDGenerator:
         Returns:
             Dictionary containing all generated IDs
         """
+        # One urandom call for the whole set, sliced per ID
+        raw = os.urandom(_TELEMETRY_RANDOM_BYTES)
+        uuid_start = _MACHINE_ID_BYTES
+        uuids = [
+            _uuid4_from_bytes(raw[o:o + _UUID_BYTES])
+            for o in range(uuid_start, uuid_start + 3 * _UUID_BYTES, _UUID_BYTES)
+        ]
+        
         ids = {
-            "machine_id": IDGenerator.generate_machine_id(),
-            "device_id": IDGenerator.generate_device_id(),
-            "mac_machine_id": IDGenerator.generate_sha256_hash(),
-            "permanent_device_id": IDGenerator.generate_uuid(),
-            "permanent_user_id": IDGenerator.generate_uuid(),
+            "machine_id": raw[:_MACHINE_ID_BYTES].hex(),
+            "device_id": uuids[0],
+            "mac_machine_id": _generate_hex_hash(raw[-16:]),
+            "permanent_device_id": uuids[1],
+            "permanent_user_id": uuids[2],
         }
         
         logger.info("Generated complete telemetry ID set")
-        for key, value in ids.items():
-            logger.debug(f"{key}: {value}")
+        if logger.isEnabledFor(logging.DEBUG):
+            for key, value in ids.items():
+                logger.debug("%s: %s", key, value)
         
         return ids
     
@@ -122,36 +197,20 @@ class IDGenerator:
         Returns:
             Generated ID string
         """
-        # Map telemetry keys to appropriate ID generation methods
-        key_lower = key.lower()
-        
-        # Handle specific telemetry keys
-        if key == "telemetry.devDeviceId":
-            # VSCode/Cursor device ID - uses UUID format
-            return IDGenerator.generate_device_id()
-        elif key == "telemetry.macMachineId":
-            # VSCode/Cursor Mac machine ID - uses SHA-256 hash
-            return IDGenerator.generate_sha256_hash()
-        elif "machineId" in key or "machine_id" in key_lower:
-            if "mac" in key_lower:
-                # macMachineId uses SHA-256 hash
-                return IDGenerator.generate_sha256_hash()
-            else:
-                # Regular machineId uses 64-char hex
-                return IDGenerator.generate_machine_id()
-        elif "deviceId" in key or "device_id" in key_lower:
-            # Device IDs use UUID
-            return IDGenerator.generate_device_id()
-        elif "userId" in key or "user_id" in key_lower:
-            # User IDs use UUID
-            return IDGenerator.generate_uuid()
-        elif "sqmId" in key:
-            # sqmId uses SHA-256 hash (based on augment-vip pattern)
-            return IDGenerator.generate_sha256_hash()
-        else:
-            # Default to UUID for unknown keys
-            logger.debug(f"Using UUID for key '{key}' (not in known patterns)")
-            return IDGenerator.generate_uuid()
+        # Exact telemetry keys: VSCode/Cursor devDeviceId (UUID) and macMachineId (SHA-256)
+        generator = _EXACT_KEY_GENERATORS.get(key)
+        if generator is not None:
+            return generator()
+        
+        # Normalise once so "machineId" and "machine_id" share one token
+        key_norm = key.lower().replace("_", "")
+        for tokens, generator in _KEY_TOKEN_GENERATORS:
+            if all(token in key_norm for token in tokens):
+                return generator()
+        
+        # Default to UUID for unknown keys
+        logger.debug("Using UUID for key '%s' (not in known patterns)", key)
+        return IDGenerator.generate_uuid()
     
     @staticmethod
     def validate_id_format(id_value: str, id_type: str) -> bool:
@@ -171,39 +230,88 @@ class IDGenerator:
         try:
             if id_type == "uuid":
                 # Validate UUID format
-                uuid.UUID(id_value)
-                return True
+                return _UUID_RE.fullmatch(id_value) is not None
             elif id_type == "machine_id":
                 # Validate 64-character hex string
-                return len(id_value) == 64 and all(c in "0123456789abcdef" for c in id_value.lower())
+                return _is_hex_digest(id_value)
             elif id_type == "sha256":
                 # Validate SHA-256 hash format
-                return len(id_value) == 64 and all(c in "0123456789abcdef" for c in id_value.lower())
+                return _is_hex_digest(id_value)
             else:
                 logger.warning(f"Unknown ID type: {id_type}")
                 return False
         except (ValueError, TypeError) as e:
-            logger.debug(f"ID validation failed for '{id_value}' (type: {id_type}): {e}")
+            logger.debug("ID validation failed for '%s' (type: %s): %s", id_value, id_type, e)
             return False
     
+    @classmethod
+    def validate_ids_batch(cls, ids: List[str], id_type: str = "machine_id") -> List[bool]:
+        """
+        Validate many IDs of the same type
+        
+        Hex IDs are checked in a single numba-compiled loop when numba is
+        installed and the batch has at least _NUMBA_BATCH_THRESHOLD entries;
+        otherwise each ID goes through validate_id_format.
+        
+        Args:
+            ids: ID values to validate
+            id_type: Type of ID (uuid, machine_id, sha256)
+            
+        Returns:
+            List of validation results in the same order as ids
+        """
+        hex_runs = None
+        if id_type in ("machine_id", "sha256") and len(ids) >= _NUMBA_BATCH_THRESHOLD:
+            # Imported here so numba/numpy only load for batches that use them
+            try:
+                from utils._id_validate_numba import hex_runs
+            except ImportError:
+                pass
+        if hex_runs is None:
+            return [cls.validate_id_format(id_value, id_type) for id_value in ids]
+        
+        results = [False] * len(ids)
+        candidates = [i for i, id_value in enumerate(ids)
+                      if isinstance(id_value, str) and len(id_value) == 64 and id_value.isascii()]
+        if candidates:
+            buf = "".join(ids[i] for i in candidates).encode("ascii")
+            for i, valid in zip(candidates, hex_runs(buf, 64)):
+                results[i] = bool(valid)
+        return results
+    
     @staticmethod
-    def backup_old_ids(old_ids: Dict[str, str]) -> Dict[str, Any]:
+    def backup_old_ids(old_ids: Dict[str, str], copy: bool = True) -> Dict[str, Any]:
         """
         Create a backup record of old IDs with metadata
         
         Args:
             old_ids: Dictionary of old ID values
+            copy: Store a copy of old_ids; pass False if the caller will not mutate it
             
         Returns:
             Backup record with metadata
         """
-        import time
-        
         backup_record = {
-            "timestamp": int(time.time()),
-            "old_ids": old_ids.copy(),
+            "timestamp": time.time_ns() // 1_000_000_000,
+            "old_ids": dict(old_ids) if copy else old_ids,
             "backup_format_version": "1.0",
         }
         
         logger.info(f"Created backup record for {len(old_ids)} IDs")
         return backup_record
+
+
+# get_id_for_key lookup tables
+_EXACT_KEY_GENERATORS = {
+    "telemetry.devDeviceId": IDGenerator.generate_device_id,
+    "telemetry.macMachineId": IDGenerator.generate_sha256_hash,
+}
+
+# (tokens that must all occur in the normalised key, generator); first match wins
+_KEY_TOKEN_GENERATORS = (
+    (("machineid", "mac"), IDGenerator.generate_sha256_hash),  # macMachineId uses SHA-256 hash
+    (("machineid",), IDGenerator.generate_machine_id),  # Regular machineId uses 64-char hex
+    (("deviceid",), IDGenerator.generate_device_id),
+    (("userid",), IDGenerator.generate_uuid),
+    (("sqmid",), IDGenerator.generate_sha256_hash),  # based on augment-vip pattern
+)
@@ -2,37 +2,88 @@
 Path management utilities for cross-platform support
 """
 
+import fnmatch
 import os
+import stat
 import sys
+from functools import cached_property
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import logging
 
 from config.settings import get_platform_paths, VSCODE_CONFIG, JETBRAINS_CONFIG
 
 logger = logging.getLogger(__name__)
 
+# JetBrains cache directory names; matched directories are recorded but not descended into
+_JETBRAINS_CACHE_NAMES = frozenset(JETBRAINS_CONFIG["cache_dirs"])
+_JETBRAINS_DB_PATTERNS = tuple(JETBRAINS_CONFIG["database_patterns"])
+
+# VSCode storage locations relative to a variant directory, joined once
+_VSCODE_GLOBAL_PATTERNS = tuple(os.path.join(*p) for p in VSCODE_CONFIG["storage_patterns"]["global"])
+_VSCODE_WORKSPACE_PATTERNS = tuple(os.path.join(*p) for p in VSCODE_CONFIG["storage_patterns"]["workspace"])
+_VSCODE_MACHINE_ID_FILES = tuple(
+    os.path.join(*p, "machineId") for p in VSCODE_CONFIG["storage_patterns"]["machine_id"]
+)
+
+# Windows MAX_PATH (260) includes the terminating NUL
+_MAX_PATH_CHARS = 259
+
+
+# Pick the platform implementation once instead of checking sys.platform per call
+if sys.platform == "win32":
+    def _ensure_long_path(path: Path) -> str:
+        """
+        Ensure long path support on Windows
+
+        Args:
+            path: Path object
+
+        Returns:
+            Absolute string path with long path prefix if needed
+        """
+        # abspath only normalises the string; no filesystem access like resolve()
+        path_str = os.path.abspath(path)
+        if len(path_str) > _MAX_PATH_CHARS and not path_str.startswith("\\\\?\\"):
+            return f"\\\\?\\{path_str}"
+        return path_str
+else:
+    def _ensure_long_path(path: Path) -> str:
+        """
+        Ensure long path support on Windows (no-op on other platforms)
+
+        Args:
+            path: Path object
+
+        Returns:
+            String path
+        """
+        return str(path)
+
 
 class PathManager:
     """Manages paths for different IDEs and platforms"""
     
     def __init__(self):
         self.platform_paths = get_platform_paths()
-        self._jetbrains_dirs = None
-        self._vscode_dirs = None
-        self._vscode_variant_map = {}  # 存储路径到变体名称的映射
+        self._workspace_storage_path = None  # 扫描VSCode目录时记录的第一个工作区存储目录
         self._vscode_variant_map = {}  # 存储路径到变体名称的映射
+        self._resolved_parents = {}  # 绝对父目录路径 -> 解析结果，仅缓存已存在的目录
+        # validate_path 使用的安全根目录，只解析一次
+        self._safe_bases = tuple(
+            Path(self.platform_paths[key]).resolve()
+            for key in ("config", "data", "home")
+            if self.platform_paths.get(key)
+        )
     
-    def get_jetbrains_config_dir(self) -> Optional[Path]:
+    @cached_property
+    def jetbrains_config_dir(self) -> Optional[Path]:
         """
         Find JetBrains configuration directory across different platforms
         
         Returns:
             Path to JetBrains config directory or None if not found
         """
-        if self._jetbrains_dirs is not None:
-            return self._jetbrains_dirs
-            
         base_dirs = [
             self.platform_paths["config"],
             self.platform_paths["data"], 
@@ -48,12 +99,15 @@ class PathManager:
             
             if jetbrains_path.exists() and jetbrains_path.is_dir():
                 logger.info(f"Found JetBrains config directory: {jetbrains_path}")
-                self._jetbrains_dirs = jetbrains_path
                 return jetbrains_path
         
         logger.warning("JetBrains configuration directory not found")
         return None
     
+    def get_jetbrains_config_dir(self) -> Optional[Path]:
+        """Compatibility wrapper for the cached jetbrains_config_dir property"""
+        return self.jetbrains_config_dir
+    
     def get_jetbrains_id_files(self) -> List[Path]:
         """
         Get list of JetBrains ID files to modify
@@ -61,7 +115,7 @@ class PathManager:
         Returns:
             List of Path objects for JetBrains ID files
         """
-        jetbrains_dir = self.get_jetbrains_config_dir()
+        jetbrains_dir = self.jetbrains_config_dir
         if not jetbrains_dir:
             return []
         
@@ -69,30 +123,53 @@ class PathManager:
         for file_name in JETBRAINS_CONFIG["id_files"]:
             file_path = jetbrains_dir / file_name
             id_files.append(file_path)
-            logger.debug(f"JetBrains ID file: {file_path}")
+            logger.debug("JetBrains ID file: %s", file_path)
         
         return id_files
 
-    def get_jetbrains_database_files(self) -> List[Path]:
+    @cached_property
+    def _jetbrains_tree(self) -> Tuple[List[Path], List[Path]]:
         """
-        Get list of JetBrains database files
+        Walk the JetBrains config tree once, collecting database files and cache directories
 
         Returns:
-            List of Path objects for JetBrains database files
+            Tuple of (database files, cache directories)
         """
         db_files = []
+        cache_dirs = []
 
-        jetbrains_dir = self.get_jetbrains_config_dir()
+        jetbrains_dir = self.jetbrains_config_dir
         if jetbrains_dir and jetbrains_dir.exists():
-            # 扫描所有子目录中的数据库文件
-            for pattern in JETBRAINS_CONFIG["database_patterns"]:
-                db_files.extend(jetbrains_dir.rglob(pattern))
+            # 单次遍历同时匹配数据库文件和缓存目录
+            for dirpath, dirnames, filenames in os.walk(jetbrains_dir):
+                descend = []
+                for dirname in dirnames:
+                    if dirname in _JETBRAINS_CACHE_NAMES:
+                        cache_dirs.append(Path(dirpath, dirname))
+                    elif not dirname.startswith('.'):
+                        descend.append(dirname)
+                # 不进入缓存目录和隐藏目录（如 .git），其中只有临时数据
+                dirnames[:] = descend
+                for filename in filenames:
+                    if any(fnmatch.fnmatch(filename, pattern) for pattern in _JETBRAINS_DB_PATTERNS):
+                        db_files.append(Path(dirpath, filename))
+
+        return db_files, cache_dirs
 
-            # 过滤出实际存在的文件
-            db_files = [f for f in db_files if f.is_file()]
+    def get_jetbrains_database_files(self) -> List[Path]:
+        """
+        Get list of JetBrains database files
+
+        Returns:
+            List of Path objects for JetBrains database files
+        """
+        db_files = list(self._jetbrains_tree[0])
+
+        if self.jetbrains_config_dir:
             logger.info(f"Found {len(db_files)} JetBrains database files")
-            for db_file in db_files:
-                logger.debug(f"JetBrains database file: {db_file}")
+            if logger.isEnabledFor(logging.DEBUG):
+                for db_file in db_files:
+                    logger.debug("JetBrains database file: %s", db_file)
 
         return db_files
 
@@ -103,32 +180,24 @@ class PathManager:
         Returns:
             List of Path objects for JetBrains cache directories
         """
-        cache_dirs = []
-
-        jetbrains_dir = self.get_jetbrains_config_dir()
-        if jetbrains_dir and jetbrains_dir.exists():
-            # 扫描缓存目录
-            for cache_name in JETBRAINS_CONFIG["cache_dirs"]:
-                cache_dirs.extend(jetbrains_dir.rglob(cache_name))
+        cache_dirs = list(self._jetbrains_tree[1])
 
-            # 过滤出实际存在的目录
-            cache_dirs = [d for d in cache_dirs if d.is_dir()]
+        if self.jetbrains_config_dir:
             logger.info(f"Found {len(cache_dirs)} JetBrains cache directories")
-            for cache_dir in cache_dirs:
-                logger.debug(f"JetBrains cache directory: {cache_dir}")
+            if logger.isEnabledFor(logging.DEBUG):
+                for cache_dir in cache_dirs:
+                    logger.debug("JetBrains cache directory: %s", cache_dir)
 
         return cache_dirs
 
-    def get_vscode_directories(self) -> List[Path]:
+    @cached_property
+    def vscode_directories(self) -> List[Path]:
         """
         Find all VSCode variant directories and their storage paths
 
         Returns:
             List of Path objects for VSCode storage directories
         """
-        if self._vscode_dirs is not None:
-            return self._vscode_dirs
-
         vscode_dirs = []
 
         # 直接查找已知的VSCode变体目录
@@ -136,7 +205,6 @@ class PathManager:
 
         if not base_path.exists():
             logger.warning(f"Config directory does not exist: {base_path}")
-            self._vscode_dirs = []
             return []
 
         # 检查每个VSCode变体
@@ -153,24 +221,20 @@ class PathManager:
                     self._vscode_variant_map[str(storage_dir)] = variant
                 vscode_dirs.extend(storage_dirs)
 
-        # Remove duplicates while preserving mapping
-        seen = set()
-        unique_dirs = []
-        for vscode_dir in vscode_dirs:
-            dir_str = str(vscode_dir)
-            if dir_str not in seen:
-                seen.add(dir_str)
-                unique_dirs.append(vscode_dir)
-
-        vscode_dirs = sorted(unique_dirs, key=str)
+        # Remove duplicates while preserving mapping, then sort by path string
+        vscode_dirs = [Path(dir_str) for dir_str in sorted(dict.fromkeys(map(str, vscode_dirs)))]
 
         logger.info(f"Found {len(vscode_dirs)} VSCode storage directories")
-        for vscode_dir in vscode_dirs:
-            logger.debug(f"VSCode storage directory: {vscode_dir}")
+        if logger.isEnabledFor(logging.DEBUG):
+            for vscode_dir in vscode_dirs:
+                logger.debug("VSCode storage directory: %s", vscode_dir)
 
-        self._vscode_dirs = vscode_dirs
         return vscode_dirs
 
+    def get_vscode_directories(self) -> List[Path]:
+        """Compatibility wrapper for the cached vscode_directories property"""
+        return self.vscode_directories
+
     def _find_vscode_storage_dirs(self, vscode_base: Path) -> List[Path]:
         """
         Find storage directories within a VSCode installation
@@ -182,39 +246,33 @@ class PathManager:
             List of storage directory paths
         """
         storage_dirs = []
+        base = str(vscode_base)
 
         # Global storage patterns
-        for pattern in VSCODE_CONFIG["storage_patterns"]["global"]:
-            storage_path = vscode_base
-            for segment in pattern:
-                storage_path = storage_path / segment
-
-            if storage_path.exists() and storage_path.is_dir():
-                storage_dirs.append(storage_path)
+        for rel_path in _VSCODE_GLOBAL_PATTERNS:
+            storage_path = os.path.join(base, rel_path)
+            if os.path.isdir(storage_path):
+                storage_dirs.append(Path(storage_path))
 
         # Workspace storage patterns - enumerate subdirectories
-        for pattern in VSCODE_CONFIG["storage_patterns"]["workspace"]:
-            workspace_base = vscode_base
-            for segment in pattern:
-                workspace_base = workspace_base / segment
+        for rel_path in _VSCODE_WORKSPACE_PATTERNS:
+            workspace_base = os.path.join(base, rel_path)
 
-            if workspace_base.exists() and workspace_base.is_dir():
+            if os.path.isdir(workspace_base):
+                if self._workspace_storage_path is None:
+                    self._workspace_storage_path = Path(workspace_base)
                 try:
-                    for workspace_dir in workspace_base.iterdir():
-                        if workspace_dir.is_dir():
-                            storage_dirs.append(workspace_dir)
+                    # DirEntry 缓存了目录项类型，无需对每个工作区再 stat 一次
+                    with os.scandir(workspace_base) as it:
+                        storage_dirs.extend(Path(entry.path) for entry in it if entry.is_dir())
                 except (PermissionError, OSError) as e:
                     logger.warning(f"Cannot access workspace directory {workspace_base}: {e}")
 
         # Machine ID file patterns
-        for pattern in VSCODE_CONFIG["storage_patterns"]["machine_id"]:
-            machine_id_base = vscode_base
-            for segment in pattern:
-                machine_id_base = machine_id_base / segment
-
-            machine_id_file = machine_id_base / "machineId"
-            if machine_id_file.exists():
-                storage_dirs.append(machine_id_file)
+        for rel_path in _VSCODE_MACHINE_ID_FILES:
+            machine_id_file = os.path.join(base, rel_path)
+            if os.path.exists(machine_id_file):
+                storage_dirs.append(Path(machine_id_file))
 
         return storage_dirs
 
@@ -240,13 +298,13 @@ class PathManager:
         Returns:
             Path to storage.json file or None if not found
         """
-        if storage_dir.is_file():
+        entries = self._dir_index(storage_dir)
+        if entries is None:
             # This is likely a machineId file
             return storage_dir
 
-        storage_file = storage_dir / "storage.json"
-        if storage_file.exists():
-            return storage_file
+        if "storage.json" in entries:
+            return storage_dir / "storage.json"
 
         return None
 
@@ -260,56 +318,79 @@ class PathManager:
         Returns:
             Path to database file or None if not found
         """
-        if storage_dir.is_file():
+        entries = self._dir_index(storage_dir)
+        if entries is None:
             # This is not a directory, skip database check
             return None
 
         for db_file in VSCODE_CONFIG["database_files"]:
-            db_path = storage_dir / db_file
-            if db_path.exists():
-                return db_path
+            if db_file in entries:
+                return storage_dir / db_file
 
         return None
 
-    def get_workspace_storage_path(self) -> Optional[Path]:
+    def _dir_index(self, storage_dir: Path) -> Optional[frozenset]:
+        """
+        List a storage directory with a single os.scandir
+
+        Args:
+            storage_dir: VSCode storage directory
+
+        Returns:
+            Set of entry names, or None if storage_dir is not a directory
+        """
+        try:
+            with os.scandir(storage_dir) as it:
+                return frozenset(entry.name for entry in it)
+        except NotADirectoryError:
+            return None
+        except OSError:
+            return frozenset()
+
+    @cached_property
+    def workspace_storage_path(self) -> Optional[Path]:
         """
         Get the main workspace storage path for cleaning
 
         Returns:
             Path to workspace storage directory or None if not found
         """
-        base_path = Path(self.platform_paths["config"])
-
-        for variant in VSCODE_CONFIG["vscode_variants"]:
-            for pattern in VSCODE_CONFIG["storage_patterns"]["workspace"]:
-                workspace_path = base_path / variant
-                for segment in pattern:
-                    workspace_path = workspace_path / segment
+        # 工作区存储目录在扫描VSCode目录时一并记录
+        self.vscode_directories
 
-                if workspace_path.exists() and workspace_path.is_dir():
-                    logger.info(f"Found workspace storage: {workspace_path}")
-                    return workspace_path
+        if self._workspace_storage_path is not None:
+            logger.info(f"Found workspace storage: {self._workspace_storage_path}")
+            return self._workspace_storage_path
 
         logger.warning("Workspace storage directory not found")
         return None
 
-    @staticmethod
-    def ensure_long_path_support(path: Path) -> str:
+    def get_workspace_storage_path(self) -> Optional[Path]:
+        """Compatibility wrapper for the cached workspace_storage_path property"""
+        return self.workspace_storage_path
+
+    ensure_long_path_support = staticmethod(_ensure_long_path)
+
+    def _resolve_parent(self, parent: str) -> Path:
         """
-        Ensure long path support on Windows
+        Resolve a parent directory, caching it only once it is known to exist
 
         Args:
-            path: Path object
+            parent: Absolute parent directory path
 
         Returns:
-            String path with long path prefix if needed
+            Resolved parent directory
         """
-        if sys.platform == "win32":
-            path_str = str(path.resolve())
-            if len(path_str) > 260 and not path_str.startswith("\\\\?\\"):
-                return f"\\\\?\\{path_str}"
-            return path_str
-        return str(path)
+        resolved = self._resolved_parents.get(parent)
+        if resolved is not None:
+            return resolved
+        try:
+            resolved = Path(parent).resolve(strict=True)
+        except OSError:
+            # Missing or unreadable: resolve leniently and try again next time
+            return Path(parent).resolve()
+        self._resolved_parents[parent] = resolved
+        return resolved
 
     def validate_path(self, path: Path) -> bool:
         """
@@ -322,24 +403,34 @@ class PathManager:
             True if path is safe, False otherwise
         """
         try:
-            # Convert to absolute path
-            abs_path = path.resolve()
-
-            # Check if path exists
-            if not abs_path.exists():
-                return False
+            # Convert to absolute path, reusing the resolved parent directory
+            if path.name in ("", ".", ".."):
+                abs_path = path.resolve()
+                if not abs_path.exists():
+                    return False
+            else:
+                parent = path.parent
+                if not parent.is_absolute():
+                    # Key the parent cache on an absolute path so a later chdir
+                    # cannot reuse another directory's result; joined, not normalised,
+                    # so ".." still goes through resolve()
+                    parent = Path(os.getcwd(), parent)
+                abs_path = self._resolve_parent(str(parent)) / path.name
+                try:
+                    # Check if path exists (lstat, so the leaf itself is not followed yet)
+                    st = os.lstat(abs_path)
+                except FileNotFoundError:
+                    return False
+                if stat.S_ISLNK(st.st_mode):
+                    # A symlinked leaf may point elsewhere; resolve it fully
+                    abs_path = abs_path.resolve()
+                    if not abs_path.exists():
+                        return False
 
             # Check if path is within expected directories
-            platform_paths = self.platform_paths
-            safe_bases = [
-                Path(platform_paths["config"]),
-                Path(platform_paths["data"]),
-                Path(platform_paths["home"]),
-            ]
-
-            for safe_base in safe_bases:
+            for safe_base in self._safe_bases:
                 try:
-                    abs_path.relative_to(safe_base.resolve())
+                    abs_path.relative_to(safe_base)
                     return True
                 except ValueError:
                     continue